@@ -1,14 +1,36 @@
 import json
+import logging
 import requests
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
+import random
 import time
 
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: rate limits and transient upstream failures
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Products per multi-prompt request, and the completion token budget for one such request
+MAX_BATCH_SIZE = 25
+MAX_BATCH_TOKENS = 16000
+
+# Request timeout: the base covers a default single-product completion; larger budgets get extra time
+# at a conservative generation rate, so long batch responses are not cut off and retried
+DEFAULT_MAX_TOKENS = 2000
+BASE_TIMEOUT = 30.0
+MIN_TOKENS_PER_SECOND = 50
+
+# Completion budget per product when only a description is requested (no specifications or corrections)
+DESCRIPTION_ONLY_TOKENS = 400
+
 @dataclass
 class OpenRouterConfig:
     api_key: str
     model_id: str
     base_url: str = "https://openrouter.ai/api/v1"
+    max_retries: int = 5
+    retry_max_wait: float = 30.0
 
 class OpenRouterClient:
     def __init__(self, config: OpenRouterConfig):
@@ -85,37 +107,137 @@ Ensure all specifications are technically accurate and relevant to {category} pr
         
         return prompt
     
-    def _make_api_call(self, prompt: str) -> Optional[str]:
-        """Make API call to OpenRouter."""
-        try:
-            payload = {
-                "model": self.config.model_id,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                "temperature": 0.3,
-                "max_tokens": 2000
-            }
-            
-            response = self.session.post(
-                f"{self.config.base_url}/chat/completions",
-                json=payload,
-                timeout=30
-            )
+    def _create_batch_enhancement_prompt(self, products_data: List[Dict[str, Any]], description_only: bool = False) -> str:
+        """Create one prompt asking for enhancements of several products, answered as an indexed JSON array."""
+        sections = []
+        for index, product_data in enumerate(products_data):
+            specs = product_data.get('specifications', [])
+            current_specs_text = "\n".join([f"- {spec}" for spec in specs]) if specs else "No specifications provided"
+            sections.append(f"""### Product {index}
+Product: {product_data.get('name', '')}
+Category: {product_data.get('category', '')}
+Current Description: {product_data.get('description', '')}
+
+Current Specifications:
+{current_specs_text}""")
+        products_text = "\n\n".join(sections)
+        
+        if description_only:
+            return f"""You are a technical specification expert. Write an improved description for each of the following {len(products_data)} products:
+
+{products_text}
+
+For every product, provide a more detailed and accurate product description that is consistent with the product category, name and specifications.
+
+Return your response as a JSON array with exactly one object per product, in this exact format:
+[
+  {{
+    "index": 0,
+    "enhanced_description": "Improved product description here"
+  }}
+]
+
+"index" must be the product number from its "### Product" heading."""
+        
+        prompt = f"""You are a technical specification expert. Enhance the specifications of each of the following {len(products_data)} products:
+
+{products_text}
+
+Tasks, for every product:
+1. Fix any technical inaccuracies or unclear specifications
+2. Add missing relevant technical specifications for this product category
+3. Ensure all specifications use proper pipe-separated format (Feature|Value)
+4. Provide a more detailed and accurate product description
+5. Maintain consistency with the product category and name
+
+Return your response as a JSON array with exactly one object per product, in this exact format:
+[
+  {{
+    "index": 0,
+    "enhanced_description": "Improved product description here",
+    "enhanced_specifications": [
+      "Feature 1|Value 1",
+      "Feature 2|Value 2"
+    ],
+    "corrections_made": [
+      "Description of correction 1"
+    ]
+  }}
+]
+
+"index" must be the product number from its "### Product" heading. Ensure all specifications are technically accurate and relevant to each product's category."""
+        
+        return prompt
+    
+    def _retry_delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """Seconds to wait before the next attempt: Retry-After if given, else full-jitter exponential backoff."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return min(float(retry_after), self.config.retry_max_wait)
+                except ValueError:
+                    pass
+        return random.uniform(0, min(self.config.retry_max_wait, 2 ** attempt))
+    
+    @staticmethod
+    def _request_timeout(max_tokens: int) -> float:
+        """Seconds to wait for a completion of up to max_tokens tokens."""
+        return BASE_TIMEOUT + max(0, max_tokens - DEFAULT_MAX_TOKENS) / MIN_TOKENS_PER_SECOND
+    
+    def _make_api_call(self, prompt: str, max_tokens: int = DEFAULT_MAX_TOKENS, timeout: Optional[float] = None) -> Optional[str]:
+        """Make API call to OpenRouter, retrying rate limits and transient failures; timeout defaults to one sized for max_tokens."""
+        if timeout is None:
+            timeout = self._request_timeout(max_tokens)
+        payload = {
+            "model": self.config.model_id,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": 0.3,
+            "max_tokens": max_tokens
+        }
+        
+        for attempt in range(self.config.max_retries + 1):
+            try:
+                response = self.session.post(
+                    f"{self.config.base_url}/chat/completions",
+                    json=payload,
+                    timeout=timeout
+                )
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                if attempt < self.config.max_retries:
+                    delay = self._retry_delay(attempt)
+                    print(f"API call error: {e} (retry {attempt + 1}/{self.config.max_retries} in {delay:.1f}s)")
+                    time.sleep(delay)
+                    continue
+                print(f"API call error: {e}")
+                return None
+            except Exception as e:
+                print(f"API call error: {e}")
+                return None
             
             if response.status_code == 200:
-                data = response.json()
-                return data['choices'][0]['message']['content']
-            else:
-                print(f"API call failed with status {response.status_code}: {response.text}")
-                return None
-                
-        except Exception as e:
-            print(f"API call error: {e}")
+                try:
+                    data = response.json()
+                    return data['choices'][0]['message']['content']
+                except Exception as e:
+                    print(f"API call error: {e}")
+                    return None
+            
+            if response.status_code in RETRYABLE_STATUS_CODES and attempt < self.config.max_retries:
+                delay = self._retry_delay(attempt, response)
+                print(f"API call failed with status {response.status_code} (retry {attempt + 1}/{self.config.max_retries} in {delay:.1f}s)")
+                time.sleep(delay)
+                continue
+            
+            print(f"API call failed with status {response.status_code}: {response.text}")
             return None
+        
+        return None
     
     def _parse_enhancement_response(self, response: str, original_data: Dict[str, Any]) -> Dict[str, Any]:
         """Parse AI response and apply enhancements."""
@@ -128,22 +250,7 @@ Ensure all specifications are technically accurate and relevant to {category} pr
                 json_str = response[start_idx:end_idx]
                 enhancement_data = json.loads(json_str)
                 
-                # Apply enhancements to original data
-                enhanced_data = original_data.copy()
-                
-                if 'enhanced_description' in enhancement_data:
-                    enhanced_data['description'] = enhancement_data['enhanced_description']
-                
-                if 'enhanced_specifications' in enhancement_data:
-                    enhanced_data['specifications'] = enhancement_data['enhanced_specifications']
-                
-                # Log corrections made
-                if 'corrections_made' in enhancement_data:
-                    print(f"Corrections made for {original_data.get('name', 'unknown')}:")
-                    for correction in enhancement_data['corrections_made']:
-                        print(f"  - {correction}")
-                
-                return enhanced_data
+                return self._apply_enhancement(enhancement_data, original_data)
             
         except json.JSONDecodeError as e:
             print(f"Failed to parse enhancement response: {e}")
@@ -152,6 +259,69 @@ Ensure all specifications are technically accurate and relevant to {category} pr
         
         return original_data
     
+    def _apply_enhancement(self, enhancement_data: Dict[str, Any], original_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply one parsed enhancement object to a copy of the original product data."""
+        enhanced_data = original_data.copy()
+        
+        if 'enhanced_description' in enhancement_data:
+            enhanced_data['description'] = enhancement_data['enhanced_description']
+        
+        if 'enhanced_specifications' in enhancement_data:
+            enhanced_data['specifications'] = enhancement_data['enhanced_specifications']
+        
+        # Log corrections made
+        if 'corrections_made' in enhancement_data:
+            logger.info("Corrections made for %s:\n%s", original_data.get('name', 'unknown'),
+                        "\n".join(f"  - {correction}" for correction in enhancement_data['corrections_made']))
+        
+        return enhanced_data
+    
+    def _parse_batch_enhancement_response(self, response: str, originals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Parse a JSON-array response and apply each enhancement to its product; unmatched products are returned unchanged."""
+        results = list(originals)
+        try:
+            start_idx = response.find('[')
+            end_idx = response.rfind(']') + 1
+            
+            if start_idx != -1 and end_idx != 0:
+                enhancements = json.loads(response[start_idx:end_idx])
+                
+                for position, enhancement_data in enumerate(enhancements):
+                    if not isinstance(enhancement_data, dict):
+                        continue
+                    index = enhancement_data.get('index', position)
+                    if isinstance(index, int) and 0 <= index < len(originals):
+                        results[index] = self._apply_enhancement(enhancement_data, originals[index])
+            
+        except json.JSONDecodeError as e:
+            print(f"Failed to parse batch enhancement response: {e}")
+        except Exception as e:
+            print(f"Error parsing batch enhancement response: {e}")
+        
+        return results
+    
+    def enhance_specifications_batch(self, products_data: List[Dict[str, Any]], max_batch_size: int = MAX_BATCH_SIZE,
+                                     description_only: bool = False) -> List[Dict[str, Any]]:
+        """
+        Enhance several products with one API call per batch of up to max_batch_size; results keep input order.
+        
+        With description_only, only descriptions are requested (specifications are returned unchanged).
+        """
+        results = []
+        tokens_per_product = DESCRIPTION_ONLY_TOKENS if description_only else DEFAULT_MAX_TOKENS
+        
+        for start in range(0, len(products_data), max_batch_size):
+            batch = products_data[start:start + max_batch_size]
+            try:
+                prompt = self._create_batch_enhancement_prompt(batch, description_only)
+                response = self._make_api_call(prompt, max_tokens=min(tokens_per_product * len(batch), MAX_BATCH_TOKENS))
+                results.extend(self._parse_batch_enhancement_response(response, batch) if response else batch)
+            except Exception as e:
+                print(f"Error enhancing batch of {len(batch)} products: {e}")
+                results.extend(batch)
+        
+        return results
+    
     def batch_enhance_products(self, products_data: Dict[str, Any], delay: float = 1.0) -> Dict[str, Any]:
         """Enhance all products in the hierarchical structure."""
         enhanced_data = products_data.copy()
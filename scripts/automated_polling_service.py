@@ -2,17 +2,19 @@
 """
 Automated Google Sheets Polling Service
 
-Monitors Google Sheets every 5 minutes for new data and updates the local catalog.
+Monitors Google Sheets for new data (every 5 minutes, backing off while idle) and updates the local catalog.
 Provides change detection, data processing, and real-time notifications.
 """
 
 import json
+import base64
 import asyncio
 import logging
 import hashlib
+import re
 import time
 from datetime import datetime, timezone
-from typing import Dict, List, Any, Optional, Set
+from typing import Dict, List, Any, Optional, Set, Tuple
 from pathlib import Path
 import csv
 from google_sheets_client import GoogleSheetsClient
@@ -20,18 +22,48 @@ from google_sheets_client import GoogleSheetsClient
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Minimum seconds between last_sync heartbeat writes while the sheet is idle
+HEARTBEAT_INTERVAL = 3600
+
+# "Features: ... [Specifications: ...]" blocks in the specifications column
+_SPECS_RE = re.compile(r'Features:(?P<features>.*?)(?:Specifications:(?P<specs>.*))?$', re.S)
+
+def _hash_rows(rows: List[List[str]]) -> Tuple[bytes, List[str]]:
+    """Return the packed md5 digests of the given rows and the model numbers (first column) seen."""
+    digests = []
+    models = []
+    for row in rows:
+        digests.append(hashlib.md5(json.dumps(row, sort_keys=True).encode('utf-8')).digest())
+        if row and row[0]:
+            model = str(row[0]).strip()
+            if model:
+                models.append(model)
+    return b"".join(digests), models
+
 class ChangeDetector:
     """Detects changes in Google Sheets data using fingerprinting."""
     
     def __init__(self, metadata_file: str = "data/polling_metadata.json"):
         self.metadata_file = metadata_file
+        metadata_path = Path(metadata_file)
+        self.heartbeat_file = str(metadata_path.with_name(f"{metadata_path.stem}_heartbeat.json"))
+        self._last_heartbeat: Optional[float] = None
         self.metadata = self._load_metadata()
     
     def _load_metadata(self) -> Dict[str, Any]:
         """Load polling metadata from file."""
         try:
             with open(self.metadata_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                metadata = json.load(f)
+            # Idle polls only record last_sync in the small heartbeat file
+            try:
+                with open(self.heartbeat_file, 'r', encoding='utf-8') as f:
+                    last_sync = json.load(f).get("last_sync")
+                if last_sync and last_sync > (metadata.get("last_sync") or ""):
+                    metadata["last_sync"] = last_sync
+            except FileNotFoundError:
+                pass
+            return metadata
         except FileNotFoundError:
             logger.info("No existing metadata found, creating new tracking state")
             return {
@@ -55,32 +87,56 @@ class ChangeDetector:
         except Exception as e:
             logger.error(f"Error saving metadata: {e}")
     
+    def _save_heartbeat(self):
+        """Persist last_sync without rewriting the full metadata file, at most once per HEARTBEAT_INTERVAL."""
+        now = time.monotonic()
+        if self._last_heartbeat is not None and now - self._last_heartbeat < HEARTBEAT_INTERVAL:
+            return
+        try:
+            Path(self.heartbeat_file).parent.mkdir(parents=True, exist_ok=True)
+            with open(self.heartbeat_file, 'w', encoding='utf-8') as f:
+                json.dump({"last_sync": self.metadata["last_sync"]}, f)
+            self._last_heartbeat = now
+        except Exception as e:
+            logger.error(f"Error saving heartbeat: {e}")
+    
+    @staticmethod
+    def _unpack_row_hashes(fingerprint: Dict[str, Any]) -> bytes:
+        """Return per-row hashes as packed 16-byte md5 digests ordered by row index."""
+        row_hashes = fingerprint.get("row_hashes") or b""
+        if isinstance(row_hashes, dict):
+            # Legacy metadata stored {"1": hexdigest, "2": ...}
+            return b"".join(bytes.fromhex(row_hashes[k]) for k in sorted(row_hashes, key=int))
+        return base64.b64decode(row_hashes)
+    
     def create_data_fingerprint(self, sheets_data: List[List[str]]) -> Dict[str, Any]:
         """Create a fingerprint of the sheets data for change detection."""
+        return self._fingerprint_with_models(sheets_data)[0]
+    
+    def _fingerprint_with_models(self, sheets_data: List[List[str]]) -> Tuple[Dict[str, Any], List[str]]:
+        """Create the fingerprint and collect the sheet's model numbers (first column) in the same pass."""
         if not sheets_data:
-            return {"row_count": 0, "data_hash": "", "row_hashes": {}}
+            return {"row_count": 0, "data_hash": "", "row_hashes": ""}, []
         
         # Calculate hash of all data
         data_str = json.dumps(sheets_data, sort_keys=True)
         data_hash = hashlib.md5(data_str.encode('utf-8')).hexdigest()
         
-        # Calculate hash for each row (excluding header) for detailed change detection
-        row_hashes = {}
-        if len(sheets_data) > 1:  # Skip header
-            for i, row in enumerate(sheets_data[1:], start=1):  # Start from 1 to account for header
-                row_str = json.dumps(row, sort_keys=True)
-                row_hashes[str(i)] = hashlib.md5(row_str.encode('utf-8')).hexdigest()
+        # Raw md5 digest for each row (excluding header), packed back to back in row order.
+        # Rows are ~100 bytes, below the size at which hashlib releases the GIL, so this stays serial.
+        row_hashes, current_sheet_models = _hash_rows(sheets_data[1:])
         
-        return {
+        fingerprint = {
             "row_count": len(sheets_data) - 1,  # Exclude header
             "data_hash": data_hash,
-            "row_hashes": row_hashes,
+            "row_hashes": base64.b64encode(row_hashes).decode('ascii'),
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
+        return fingerprint, current_sheet_models
     
     def detect_changes(self, current_data: List[List[str]]) -> Dict[str, Any]:
         """Detect what has changed since last check."""
-        current_fingerprint = self.create_data_fingerprint(current_data)
+        current_fingerprint, current_sheet_models = self._fingerprint_with_models(current_data)
         
         changes = {
             "has_changes": False,
@@ -91,16 +147,19 @@ class ChangeDetector:
             "modified_row_count": 0,
             "deleted_row_count": 0,
             "total_rows": current_fingerprint["row_count"],
-            "previous_rows": self.metadata.get("sheet_fingerprint", {}).get("row_count", 0)
+            "previous_rows": self.metadata.get("sheet_fingerprint", {}).get("row_count", 0),
+            "current_sheet_models": current_sheet_models
         }
         
         previous_fingerprint = self.metadata.get("sheet_fingerprint", {})
-        previous_row_hashes = previous_fingerprint.get("row_hashes", {})
-        current_row_hashes = current_fingerprint["row_hashes"]
         
         # Check if data hash changed
         if current_fingerprint["data_hash"] != previous_fingerprint.get("data_hash"):
             changes["has_changes"] = True
+            previous_row_hashes = self._unpack_row_hashes(previous_fingerprint)
+            current_row_hashes = self._unpack_row_hashes(current_fingerprint)
+            previous_hashed_rows = len(previous_row_hashes) // 16
+            current_hashed_rows = len(current_row_hashes) // 16
             
             # Check for new rows
             previous_row_count = previous_fingerprint.get("row_count", 0)
@@ -115,21 +174,23 @@ class ChangeDetector:
                 
                 logger.info(f"Detected {len(new_rows)} new rows in Google Sheets")
             
-            # Check for modified existing rows
+            # Check for modified existing rows; row i (1-based, header is row 0) lives at offset 16*(i-1)
             modified_rows = []
-            for row_index, current_hash in current_row_hashes.items():
-                if row_index in previous_row_hashes:
-                    if current_hash != previous_row_hashes[row_index]:
-                        # Row has been modified
-                        row_data_index = int(row_index)  # This is 1-based row number
-                        # Access the data array: header is at index 0, first data row at index 1, etc.
-                        if row_data_index <= len(current_data) - 1:  # Check bounds
-                            modified_rows.append({
-                                "row_index": row_data_index,
-                                "row_data": current_data[row_data_index],  # row_data_index is already correct for 0-based array
-                                "previous_hash": previous_row_hashes[row_index],
-                                "current_hash": current_hash
-                            })
+            common_length = 16 * min(previous_hashed_rows, current_hashed_rows)
+            # Pure appends/deletions leave the shared prefix untouched; one memcmp rules out any modification
+            if current_row_hashes[:common_length] == previous_row_hashes[:common_length]:
+                common_length = 0
+            for offset in range(0, common_length, 16):
+                current_hash = current_row_hashes[offset:offset + 16]
+                previous_hash = previous_row_hashes[offset:offset + 16]
+                if current_hash != previous_hash:
+                    row_data_index = offset // 16 + 1
+                    modified_rows.append({
+                        "row_index": row_data_index,
+                        "row_data": current_data[row_data_index],
+                        "previous_hash": previous_hash.hex(),
+                        "current_hash": current_hash.hex()
+                    })
             
             if modified_rows:
                 changes["modified_rows"] = modified_rows
@@ -138,23 +199,24 @@ class ChangeDetector:
             
             # Check for deleted rows (rows that existed before but not now)
             deleted_rows = []
-            for row_index, previous_hash in previous_row_hashes.items():
-                if row_index not in current_row_hashes:
-                    # This row was deleted
-                    deleted_rows.append({
-                        "row_index": int(row_index),
-                        "previous_hash": previous_hash
-                    })
+            for offset in range(16 * current_hashed_rows, 16 * previous_hashed_rows, 16):
+                deleted_rows.append({
+                    "row_index": offset // 16 + 1,
+                    "previous_hash": previous_row_hashes[offset:offset + 16].hex()
+                })
             
             if deleted_rows:
                 changes["deleted_rows"] = deleted_rows
                 changes["deleted_row_count"] = len(deleted_rows)
                 logger.info(f"Detected {len(deleted_rows)} deleted rows in Google Sheets")
         
-        # Update metadata
-        self.metadata["sheet_fingerprint"] = current_fingerprint
+        # Update metadata; the full file is only rewritten when the sheet actually changed
         self.metadata["last_sync"] = datetime.now(timezone.utc).isoformat()
-        self._save_metadata()
+        if changes["has_changes"]:
+            self.metadata["sheet_fingerprint"] = current_fingerprint
+            self._save_metadata()
+        else:
+            self._save_heartbeat()
         
         return changes
 
@@ -256,6 +318,9 @@ class DataProcessor:
     
     def _create_product_from_row(self, row: List[str], headers: List[str]) -> Optional[Dict[str, Any]]:
         """Create a product object from a Google Sheets row matching the current products.json structure."""
+        # Strip every cell once up front; UNFORMATTED_VALUE can return numbers, so only those go through str()
+        row = [c.strip() if isinstance(c, str) else str(c) for c in row]
+        
         # Ensure row has the same length as headers by padding with empty strings
         if len(row) < len(headers):
             row = row + [''] * (len(headers) - len(row))
@@ -276,11 +341,11 @@ class DataProcessor:
             for name in possible_names:
                 # Try exact match first
                 if name in row_data:
-                    return str(row_data[name]).strip()
+                    return row_data[name]
                 # Try case-insensitive match
                 name_lower = name.lower()
                 if name_lower in header_map:
-                    return str(row_data[header_map[name_lower]]).strip()
+                    return row_data[header_map[name_lower]]
             return ''
         
         # Extract key fields based on the brochure-products sheet structure
@@ -315,16 +380,11 @@ class DataProcessor:
             return "", ""
         
         # Look for common patterns that separate features from specifications
-        if 'Features:' in specs_text and 'Specifications:' in specs_text:
-            parts = specs_text.split('Specifications:', 1)
-            if len(parts) == 2:
-                features_part = parts[0].replace('Features:', '').strip()
-                specs_part = parts[1].strip()
-                return features_part, specs_part
-        elif 'Features:' in specs_text:
-            # If only Features section exists, use it as description
-            description = specs_text.replace('Features:', '').strip()
-            return description, ""
+        match = _SPECS_RE.search(specs_text)
+        if match:
+            # Text before the Features: marker (if any) belongs to the description
+            features_part = (specs_text[:match.start()] + match.group('features')).strip()
+            return features_part, (match.group('specs') or "").strip()
         else:
             # If no clear structure, use first part as description
             sentences = specs_text.split('|')
@@ -335,19 +395,6 @@ class DataProcessor:
             else:
                 return specs_text.strip(), ""
     
-    def _parse_price(self, price_str: str) -> float:
-        """Parse price string to float."""
-        if not price_str:
-            return 0.0
-        
-        # Remove currency symbols and whitespace
-        price_clean = price_str.replace('$', '').replace('USD', '').replace('US$', '').strip()
-        
-        try:
-            return float(price_clean)
-        except ValueError:
-            return 0.0
-    
     def update_catalog(self, new_products: List[Dict[str, Any]] = None, modified_products: List[Dict[str, Any]] = None, current_sheet_models: List[str] = None) -> bool:
         """Add new products, update modified products, and remove deleted products from the catalog."""
         if not new_products and not modified_products and not current_sheet_models:
@@ -466,7 +513,11 @@ class AutomatedPollingService:
         self.data_processor = DataProcessor(catalog_path)
         self.notification_callback = notification_callback
         self.is_running = False
-        self.poll_interval = 300  # 5 minutes
+        self.poll_interval = 300  # 5 minutes, starting cadence
+        self.min_poll_interval = 30  # cadence right after a detected change
+        self.max_poll_interval = 1800  # idle cap, 30 minutes
+        self.idle_backoff = 1.5
+        self.current_poll_interval = self.poll_interval
         self.stats = {
             "last_check": None,
             "total_checks": 0,
@@ -480,14 +531,19 @@ class AutomatedPollingService:
         """Start the automated polling service."""
         self.is_running = True
         logger.info("Starting automated polling service...")
-        logger.info(f"Polling interval: {self.poll_interval} seconds")
+        logger.info(f"Polling interval: {self.poll_interval} seconds (adaptive {self.min_poll_interval}-{self.max_poll_interval}s)")
         
         while self.is_running:
             try:
-                await self._poll_and_process()
+                changed = await self._poll_and_process()
                 self.stats["last_check"] = datetime.now(timezone.utc).isoformat()
                 self.stats["total_checks"] += 1
-                await asyncio.sleep(self.poll_interval)
+                # Poll quickly after edits and back off while the sheet is idle
+                if changed:
+                    self.current_poll_interval = self.min_poll_interval
+                else:
+                    self.current_poll_interval = min(self.current_poll_interval * self.idle_backoff, self.max_poll_interval)
+                await asyncio.sleep(self.current_poll_interval)
             except Exception as e:
                 logger.error(f"Error in polling loop: {e}")
                 self.stats["errors"] += 1
@@ -498,37 +554,36 @@ class AutomatedPollingService:
         self.is_running = False
         logger.info("Stopping polling service...")
     
-    async def _poll_and_process(self):
-        """Poll Google Sheets and process any changes."""
+    async def _poll_and_process(self) -> bool:
+        """Poll Google Sheets and process any changes. Returns True if the sheet changed."""
         try:
             logger.info("Checking Google Sheets for changes...")
             
-            # Get current sheets data
-            sheets_data = self.client.get_sheet_data(self.spreadsheet_id, "brochure-products")
+            # Get current sheets data (blocking HTTP call, run off the event loop)
+            sheets_data = await asyncio.to_thread(
+                self.client.get_sheet_data_if_modified, self.spreadsheet_id, "brochure-products"
+            )
+            
+            if sheets_data is None:
+                logger.info("Google Sheets not modified since last check")
+                return False
             
             if not sheets_data:
                 logger.warning("No data found in Google Sheets")
-                return
+                return False
             
-            # Detect changes
-            changes = self.change_detector.detect_changes(sheets_data)
+            # Detect changes (hashing + metadata file I/O)
+            changes = await asyncio.to_thread(self.change_detector.detect_changes, sheets_data)
             
             if not changes["has_changes"]:
                 logger.info("No changes detected in Google Sheets")
-                return
+                return False
             
             headers = sheets_data[0] if sheets_data else []
             new_products = []
             modified_products = []
-            current_sheet_models = []
-            
-            # Extract current model numbers from sheet data for deletion detection
-            if len(sheets_data) > 1:  # Skip header
-                for row in sheets_data[1:]:
-                    if len(row) > 0:  # Make sure row has at least model number
-                        model = row[0].strip() if row[0] else ""
-                        if model:
-                            current_sheet_models.append(model)
+            # Current model numbers for deletion detection, collected while hashing
+            current_sheet_models = changes["current_sheet_models"]
             
             # Process new rows
             if changes["new_row_count"] > 0:
@@ -562,15 +617,17 @@ class AutomatedPollingService:
             
             # Update catalog with new, modified, and deleted products
             if new_products or modified_products or current_sheet_models:
-                success = self.data_processor.update_catalog(new_products, modified_products, current_sheet_models)
+                success = await asyncio.to_thread(
+                    self.data_processor.update_catalog, new_products, modified_products, current_sheet_models
+                )
                 
                 if success:
                     # Send notifications
                     if new_products:
-                        await self._notify_new_products(new_products)
+                        await self._notify("new_products", new_products)
                     
                     if modified_products:
-                        await self._notify_modified_products(modified_products)
+                        await self._notify("modified_products", modified_products)
                     
                     # Send callback notification if provided
                     if self.notification_callback:
@@ -584,50 +641,34 @@ class AutomatedPollingService:
                 else:
                     logger.error("Failed to update catalog")
             
+            return True
+            
         except Exception as e:
             logger.error(f"Error polling and processing: {e}")
+            return False
     
-    async def _notify_new_products(self, new_products: List[Dict[str, Any]]):
-        """Send notification about new products (placeholder for WebSocket integration)."""
-        notification = {
-            "type": "new_products",
-            "count": len(new_products),
-            "products": [{"name": p["name"], "model": p.get("model"), "category": p.get("category")} for p in new_products],
-            "timestamp": datetime.now(timezone.utc).isoformat()
-        }
-        
-        # TODO: Implement WebSocket broadcasting
-        logger.info(f"New products notification: {notification}")
-    
-    async def _notify_modified_products(self, modified_products: List[Dict[str, Any]]):
-        """Send notification about modified products (placeholder for WebSocket integration)."""
-        notification = {
-            "type": "modified_products",
-            "count": len(modified_products),
-            "products": [{"name": p["name"], "model": p.get("model"), "category": p.get("category")} for p in modified_products],
-            "timestamp": datetime.now(timezone.utc).isoformat()
-        }
+    async def _notify(self, kind: str, products: List[Dict[str, Any]]):
+        """Send a product change notification (placeholder for WebSocket integration)."""
+        # Nobody would see the notification: skip building it at all
+        if self.notification_callback is None and not logger.isEnabledFor(logging.INFO):
+            return
         
-        # TODO: Implement WebSocket broadcasting
-        logger.info(f"Modified products notification: {notification}")
-    
-    async def _notify_deleted_products(self, deleted_products: List[Dict[str, Any]]):
-        """Send notification about deleted products (placeholder for WebSocket integration)."""
         notification = {
-            "type": "deleted_products",
-            "count": len(deleted_products),
-            "products": [{"name": p.get("name", "Unknown"), "model": p.get("model", "No model")} for p in deleted_products],
+            "type": kind,
+            "count": len(products),
+            "products": [{"name": p.get("name", "Unknown"), "model": p.get("model"), "category": p.get("category")} for p in products],
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
         
         # TODO: Implement WebSocket broadcasting
-        logger.info(f"Deleted products notification: {notification}")
+        logger.info("%s notification: %s", kind.replace('_', ' ').capitalize(), notification)
     
     def get_status(self) -> Dict[str, Any]:
         """Get current polling service status."""
         return {
             "is_running": self.is_running,
             "poll_interval": self.poll_interval,
+            "current_poll_interval": self.current_poll_interval,
             "last_sync": self.change_detector.metadata.get("last_sync"),
             "last_check": self.stats["last_check"],
             "total_checks": self.stats["total_checks"],
@@ -12,20 +12,35 @@ This script provides a comprehensive pipeline for:
 """
 
 import json
-import csv
+import contextlib
+import gc
 import os
+import re
+import asyncio
+import shelve
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Set, Any, Optional
+from typing import Dict, List, Set, Any, Optional, Iterable, Iterator
 import hashlib
+import itertools
 import logging
+import mmap
 from pathlib import Path
 
+import pandas as pd
+
 # Add the project root to the path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from brochure.openrouter_client import create_openrouter_client
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -37,35 +52,192 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Maximum number of OpenRouter enhancement requests in flight at once
+MAX_CONCURRENT_ENHANCEMENTS = 20
+
+# CSV columns read by convert_csv_to_enhanced_format; everything else is skipped at parse time
+CSV_COLUMNS = {
+    'Supplier', 'Model', 'Product Name', 'Category', 'Specifications', 'Price', 'Country', 'MOQ',
+    'Catalogue', 'Packing', 'Status', 'Designation FR', 'Ref HeyZack', 'Drive Link', 'Lead Time'
+}
+CSV_CHUNK_SIZE = 10000
+
+# JSON files at least this large are memory-mapped instead of read into a bytes copy
+MMAP_THRESHOLD = 1 << 20
+
+# First number in a price string such as "$12.50 FOB"
+_PRICE_RE = re.compile(r'([0-9]+(?:\.[0-9]+)?)')
+
+# Spec keywords (matched against lowercased spec lines) -> canonical protocol / power source labels
+_PROTOCOL_RE = re.compile(r'wi-?fi|bluetooth|zigbee|z-wave')
+_PROTOCOL_LABELS = {
+    'wi-fi': 'Wi-Fi',
+    'wifi': 'Wi-Fi',
+    'bluetooth': 'Bluetooth',
+    'zigbee': 'Zigbee',
+    'z-wave': 'Z-Wave'
+}
+_POWER_RE = re.compile(r'battery|hardwire|\bac\b|usb|solar')
+_POWER_LABELS = {
+    'battery': 'Battery powered',
+    'hardwire': 'AC powered',
+    'ac': 'AC powered',
+    'usb': 'USB powered',
+    'solar': 'Solar powered'
+}
+# When one spec line mentions several power sources, the first label listed here wins
+_POWER_PRIORITY = ('Battery powered', 'AC powered', 'USB powered', 'Solar powered')
+
+@contextlib.contextmanager
+def _gc_paused():
+    """Suspend cyclic GC while building large numbers of small dicts/lists."""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
 class ProductProcessor:
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", max_concurrency: int = MAX_CONCURRENT_ENHANCEMENTS, split_categories: bool = False):
         self.data_dir = Path(data_dir)
+        self.max_concurrency = max_concurrency
+        # Split mode stores one file per category plus an index, so saves only rewrite changed categories.
+        # The monolithic "bundle" file stays the default because other scripts read it directly.
+        self.split_categories = split_categories
         self.csv_file = self.data_dir / "SMART HOME FOLLOWING PROJECT - All Products.csv"
         self.enhanced_json = self.data_dir / "products_hierarchical_enhanced.json"
+        self.categories_dir = self.data_dir / "categories"
+        self.categories_index = self.categories_dir / "_index.json"
+        self.categories_updated: Set[str] = set()
         self.products_json = self.data_dir / "products.json"
         self.openrouter_client = create_openrouter_client()
+        # Enhanced descriptions keyed by a hash of the prompt inputs, persisted across runs.
+        # Opened only while add_products_to_enhanced_json runs, so the DB is never left locked or unflushed.
+        self.cache_path = self.data_dir / ".enhance_cache.db"
+        self._cache: Optional[shelve.Shelf] = None
+        self._cache_lock = threading.Lock()
+        self._category_index: Dict[str, List[Dict[str, Any]]] = {}
+        self._indexed_data: Optional[Dict[str, Any]] = None
+    
+    def close(self) -> None:
+        """Flush and close the enhancement cache if it is open."""
+        with self._cache_lock:
+            if self._cache is not None:
+                self._cache.close()
+                self._cache = None
+    
+    def __enter__(self) -> "ProductProcessor":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+        
+    @staticmethod
+    def _dumps(data: Any) -> bytes:
+        """Serialize data as indented UTF-8 JSON, using orjson when it is installed."""
+        if orjson is not None:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    
+    @classmethod
+    def _write_json(cls, path: Path, data: Any) -> None:
+        """Write data as indented UTF-8 JSON."""
+        path.write_bytes(cls._dumps(data))
+    
+    @classmethod
+    def _write_json_streamed(cls, path: Path, data: Dict[str, Any], stream_key: str = 'categories') -> None:
+        """
+        Write data like _write_json, but serialize data[stream_key] one entry at a time.
         
-    def load_csv_products(self) -> List[Dict[str, Any]]:
-        """Load all products from CSV file."""
-        products = []
+        Peak memory is bounded by the largest entry instead of the whole document.
+        Nested values are re-indented by prefixing newlines, which is safe because
+        JSON strings never contain raw newlines.
+        """
+        def nested(value: Any, depth: int) -> bytes:
+            return cls._dumps(value).replace(b'\n', b'\n' + b'  ' * depth)
+        
+        with open(path, 'wb') as file:
+            file.write(b'{')
+            for i, (key, value) in enumerate(data.items()):
+                file.write(b',\n  ' if i else b'\n  ')
+                file.write(cls._dumps(key) + b': ')
+                if key != stream_key or not value:
+                    file.write(nested(value, 1))
+                    continue
+                file.write(b'{')
+                for j, (entry_key, entry) in enumerate(value.items()):
+                    file.write(b',\n    ' if j else b'\n    ')
+                    file.write(cls._dumps(entry_key) + b': ' + nested(entry, 2))
+                file.write(b'\n  }')
+            file.write(b'\n}' if data else b'}')
+    
+    def iter_csv_products(self) -> Iterator[Dict[str, Any]]:
+        """Stream products from the CSV file, parsed in chunks by pandas."""
+        count = 0
         try:
-            with open(self.csv_file, 'r', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    if row.get('Drive Link'):  # Only process products with drive links
-                        products.append(row)
-            logger.info(f"Loaded {len(products)} products from CSV")
-            return products
+            chunks = pd.read_csv(
+                self.csv_file,
+                encoding='utf-8',
+                dtype=str,
+                na_filter=False,
+                usecols=lambda column: column in CSV_COLUMNS,
+                chunksize=CSV_CHUNK_SIZE
+            )
+            for chunk in chunks:
+                if 'Drive Link' not in chunk.columns:
+                    break
+                # Only process products with drive links. pandas keeps raw \r\n / \r inside quoted
+                # fields, so normalize them to \n as a text-mode csv reader would.
+                rows = chunk[chunk['Drive Link'] != ''].replace(r'\r\n?', '\n', regex=True)
+                for row in rows.to_dict(orient='records'):
+                    count += 1
+                    yield row
+            logger.info(f"Loaded {count} products from CSV")
         except Exception as e:
             logger.error(f"Error loading CSV: {e}")
-            return []
+    
+    @staticmethod
+    def _category_slug(category: str) -> str:
+        """File-name-safe slug for a category name."""
+        return re.sub(r'[^a-z0-9]+', '-', category.lower()).strip('-') or 'uncategorized'
+    
+    @staticmethod
+    def _read_json(path: Path) -> Any:
+        """Read a JSON file, using orjson when it is installed (memory-mapped for large files)."""
+        if orjson is None:
+            with open(path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        
+        with open(path, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < MMAP_THRESHOLD:
+                return orjson.loads(file.read())
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                return orjson.loads(view)
+    
+    def _load_split_enhanced_json(self) -> Dict[str, Any]:
+        """Reassemble enhanced data from the per-category files listed in the index."""
+        index = self._read_json(self.categories_index)
+        categories = {
+            name: self._read_json(self.categories_dir / entry['file'])
+            for name, entry in index['categories'].items()
+        }
+        return {"metadata": index['metadata'], "categories": categories}
     
     def load_enhanced_json(self) -> Dict[str, Any]:
         """Load existing enhanced JSON data."""
+        path = self.enhanced_json
         try:
-            if self.enhanced_json.exists():
-                with open(self.enhanced_json, 'r', encoding='utf-8') as file:
-                    data = json.load(file)
+            if self.split_categories and self.categories_index.exists():
+                with _gc_paused():
+                    data = self._load_split_enhanced_json()
+                logger.info(f"Loaded {len(data['categories'])} category files from {self.categories_dir}")
+                return data
+            if path.exists():
+                with _gc_paused():
+                    data = self._read_json(path)
                 logger.info(f"Loaded enhanced JSON with {data.get('metadata', {}).get('total_products', 0)} products")
                 return data
             else:
@@ -94,53 +266,83 @@ class ProductProcessor:
             "categories": {}
         }
     
+    def _build_category_index(self, enhanced_data: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+        """Map category name -> its products list, memoized for the given enhanced data."""
+        if self._indexed_data is not enhanced_data:
+            categories = enhanced_data.setdefault("categories", {})
+            self._category_index = {name: category_data.setdefault("products", []) for name, category_data in categories.items()}
+            self._indexed_data = enhanced_data
+        return self._category_index
+    
     def get_existing_product_ids(self, enhanced_data: Dict[str, Any]) -> Set[str]:
         """Extract all existing product IDs from enhanced JSON."""
-        existing_ids = set()
-        for category_data in enhanced_data.get("categories", {}).values():
-            for product in category_data.get("products", []):
-                existing_ids.add(product.get("id", ""))
-        return existing_ids
+        category_index = self._build_category_index(enhanced_data)
+        return {product.get("id", "") for products in category_index.values() for product in products}
     
     def create_product_id(self, supplier: str, model: str) -> str:
         """Create consistent product ID from supplier and model."""
         return f"{supplier}_{model}".replace(" ", "_").replace("/", "_")
     
-    def detect_new_products(self, csv_products: List[Dict], existing_ids: Set[str]) -> List[Dict]:
-        """Detect products in CSV that are not in enhanced JSON."""
-        new_products = []
-        for product in csv_products:
-            product_id = self.create_product_id(
-                product.get('Supplier', ''),
-                product.get('Model', '')
+    def _csv_product_id(self, csv_product: Dict[str, Any]) -> str:
+        """Return the product ID for a CSV row, computing it at most once per row."""
+        product_id = csv_product.get('_pid')
+        if product_id is None:
+            product_id = csv_product['_pid'] = self.create_product_id(
+                csv_product.get('Supplier', ''),
+                csv_product.get('Model', '')
             )
-            if product_id not in existing_ids:
-                new_products.append(product)
+        return product_id
+    
+    def detect_new_products(self, csv_products: Iterable[Dict], existing_ids: Set[str]) -> List[Dict]:
+        """Detect products in CSV that are not in enhanced JSON."""
+        new_products = [product for product in csv_products if self._csv_product_id(product) not in existing_ids]
         
         logger.info(f"Found {len(new_products)} new products to process")
         return new_products
     
-    def enhance_product_description(self, product: Dict[str, Any]) -> str:
-        """Generate enhanced description using OpenRouter."""
+    def enhance_product_description(self, product: Dict[str, Any], specifications: Optional[List[str]] = None) -> str:
+        """Generate enhanced description using OpenRouter; pass already-parsed specifications to skip re-parsing."""
+        if specifications is None:
+            specifications = self.parse_specifications(product.get('Specifications', ''))
+        category = product.get('Category', '') or ''
+        category_lower = category.lower()
+        fallback_description = f"High-quality {category_lower} device with advanced features and reliable performance."
         try:
             # Prepare product data for enhancement
             product_data = {
                 'name': product.get('Product Name', ''),
-                'category': product.get('Category', ''),
-                'description': f"Smart home {product.get('Category', '').lower()} device",
-                'specifications': self.parse_specifications(product.get('Specifications', ''))
+                'category': category,
+                'description': f"Smart home {category_lower} device",
+                'specifications': specifications
             }
             
+            # Skip the LLM entirely if these exact inputs were enhanced before
+            cache_key = hashlib.blake2b(json.dumps({
+                'name': product_data['name'],
+                'category': product_data['category'],
+                'specs': product_data['specifications']
+            }, sort_keys=True).encode('utf-8')).hexdigest()
+            with self._cache_lock:
+                cached = self._cache.get(cache_key) if self._cache is not None else None
+            if cached is not None:
+                return cached
+            
             # Use existing OpenRouter client to enhance
             enhanced_data = self.openrouter_client.enhance_specifications(product_data)
             
-            # Extract enhanced description
-            return enhanced_data.get('enhanced_description', 
-                f"High-quality {product.get('Category', '').lower()} device with advanced features and reliable performance.")
+            # The client returns product_data with 'description' replaced by the AI text; an unchanged
+            # description means no enhancement. Only genuine enhancements are cached.
+            description = enhanced_data.get('description')
+            if description and description != product_data['description']:
+                with self._cache_lock:
+                    if self._cache is not None:
+                        self._cache[cache_key] = description
+                return description
+            return fallback_description
             
         except Exception as e:
             logger.error(f"Error enhancing product description: {e}")
-            return f"High-quality {product.get('Category', '').lower()} device with advanced features and reliable performance."
+            return fallback_description
     
     def parse_specifications(self, specs_text: str) -> List[str]:
         """Parse specification text into structured list."""
@@ -161,16 +363,14 @@ class ProductProcessor:
     
     def convert_csv_to_enhanced_format(self, csv_product: Dict[str, Any]) -> Dict[str, Any]:
         """Convert CSV product to enhanced JSON format."""
-        product_id = self.create_product_id(
-            csv_product.get('Supplier', ''),
-            csv_product.get('Model', '')
-        )
-        
-        # Generate enhanced description
-        enhanced_description = self.enhance_product_description(csv_product)
+        product_id = self._csv_product_id(csv_product)
         
-        # Parse specifications
+        # Parse specifications once; shared by the enhancement prompt and the extractors
         specifications = self.parse_specifications(csv_product.get('Specifications', ''))
+        specifications_lower = [spec.lower() for spec in specifications]
+        
+        # Generate enhanced description
+        enhanced_description = self.enhance_product_description(csv_product, specifications)
         
         # Extract price information
         price_raw = csv_product.get('Price', '')
@@ -184,8 +384,8 @@ class ProductProcessor:
             "category": csv_product.get('Category', ''),
             "specifications": specifications,
             "description": enhanced_description,
-            "communication_protocol": self._extract_communication_protocol(specifications),
-            "power_source": self._extract_power_source(specifications),
+            "communication_protocol": self._extract_communication_protocol(specifications_lower),
+            "power_source": self._extract_power_source(specifications_lower),
             "country": csv_product.get('Country', None),
             "image": None,
             "price": price,
@@ -205,9 +405,12 @@ class ProductProcessor:
         if not price_text:
             return None
         
-        import re
+        # Plain integer prices need no regex
+        if price_text.isdigit():
+            return float(price_text)
+        
         # Extract first number found in the text
-        match = re.search(r'([0-9]+\.?[0-9]*)', price_text.replace(',', ''))
+        match = _PRICE_RE.search(price_text.replace(',', ''))
         if match:
             try:
                 return float(match.group(1))
@@ -215,72 +418,86 @@ class ProductProcessor:
                 return None
         return None
     
-    def _extract_communication_protocol(self, specifications: List[str]) -> str:
-        """Extract communication protocol from specifications."""
-        protocols = []
-        for spec in specifications:
-            spec_lower = spec.lower()
-            if 'wi-fi' in spec_lower or 'wifi' in spec_lower:
-                protocols.append('Wi-Fi')
-            if 'bluetooth' in spec_lower:
-                protocols.append('Bluetooth')
-            if 'zigbee' in spec_lower:
-                protocols.append('Zigbee')
-            if 'z-wave' in spec_lower:
-                protocols.append('Z-Wave')
+    def _extract_communication_protocol(self, specifications_lower: List[str]) -> str:
+        """Extract communication protocol from lowercased specifications."""
+        protocols = [_PROTOCOL_LABELS[match] for match in _PROTOCOL_RE.findall('\n'.join(specifications_lower))]
         
-        return ', '.join(list(set(protocols))) if protocols else 'Not specified'
-    
-    def _extract_power_source(self, specifications: List[str]) -> str:
-        """Extract power source from specifications."""
-        for spec in specifications:
-            spec_lower = spec.lower()
-            if 'battery' in spec_lower:
-                return 'Battery powered'
-            if 'ac' in spec_lower or 'hardwire' in spec_lower:
-                return 'AC powered'
-            if 'usb' in spec_lower:
-                return 'USB powered'
-            if 'solar' in spec_lower:
-                return 'Solar powered'
+        # dict.fromkeys dedups while keeping detection order, so output is stable across runs
+        return ', '.join(dict.fromkeys(protocols)) or 'Not specified'
+    
+    def _extract_power_source(self, specifications_lower: List[str]) -> str:
+        """Extract power source from lowercased specifications."""
+        for spec in specifications_lower:
+            found = {_POWER_LABELS[match] for match in _POWER_RE.findall(spec)}
+            for label in _POWER_PRIORITY:
+                if label in found:
+                    return label
         
         return 'Not specified'
     
+    async def _enhance_one(self, executor: ThreadPoolExecutor, csv_product: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert and enhance a single CSV product on one of the executor's worker threads."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self.convert_csv_to_enhanced_format, csv_product)
+    
+    async def _enhance_all(self, new_products: List[Dict]) -> List[Any]:
+        """Enhance all new products concurrently; failures are returned as exceptions in input order."""
+        # A dedicated pool, so max_concurrency is the real limit (the loop's default executor may be smaller)
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            return await asyncio.gather(
+                *[self._enhance_one(executor, csv_product) for csv_product in new_products],
+                return_exceptions=True
+            )
+    
     def add_products_to_enhanced_json(self, enhanced_data: Dict[str, Any], new_products: List[Dict]) -> Dict[str, Any]:
         """Add new products to enhanced JSON structure."""
         enhanced_count = 0
         failed_count = 0
-        categories_updated = set()
+        categories_updated = self.categories_updated = set()
         
-        for csv_product in new_products:
-            try:
-                enhanced_product = self.convert_csv_to_enhanced_format(csv_product)
-                category = enhanced_product['category']
-                
-                # Initialize category if it doesn't exist
-                if category not in enhanced_data['categories']:
-                    enhanced_data['categories'][category] = {
-                        'name': category,
-                        'products': []
-                    }
-                
-                # Add product to category
-                enhanced_data['categories'][category]['products'].append(enhanced_product)
-                enhanced_count += 1
-                categories_updated.add(category)
-                
-                logger.info(f"Enhanced product: {enhanced_product['name']} ({enhanced_product['id']})")
-                
-            except Exception as e:
-                logger.error(f"Failed to enhance product {csv_product.get('Product Name', 'Unknown')}: {e}")
-                failed_count += 1
+        category_index = self._build_category_index(enhanced_data)
+        
+        # OpenRouter round-trips dominate, so run them concurrently and merge in input order
+        self._cache = shelve.open(str(self.cache_path))
+        try:
+            results = asyncio.run(self._enhance_all(new_products))
+        finally:
+            self.close()
+        
+        # Cyclic GC stays on during the network phase above; pause it only while merging results
+        with _gc_paused():
+            for csv_product, enhanced_product in zip(new_products, results):
+                try:
+                    if isinstance(enhanced_product, Exception):
+                        raise enhanced_product
+                    category = enhanced_product['category']
+                    
+                    # Initialize category if it doesn't exist
+                    category_products = category_index.get(category)
+                    if category_products is None:
+                        enhanced_data['categories'][category] = {
+                            'name': category,
+                            'products': []
+                        }
+                        category_products = category_index[category] = enhanced_data['categories'][category]['products']
+                    
+                    # Add product to category
+                    category_products.append(enhanced_product)
+                    enhanced_count += 1
+                    categories_updated.add(category)
+                    
+                    logger.info(f"Enhanced product: {enhanced_product['name']} ({enhanced_product['id']})")
+                    
+                except Exception as e:
+                    logger.error(f"Failed to enhance product {csv_product.get('Product Name', 'Unknown')}: {e}")
+                    failed_count += 1
         
         # Update metadata
         enhanced_data['metadata'].update({
             'enhanced_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             'categories_count': len(enhanced_data['categories']),
             'enhancement_stats': {
-                'total_products': sum(len(cat['products']) for cat in enhanced_data['categories'].values()),
+                'total_products': sum(len(products) for products in category_index.values()),
                 'enhanced_products': enhanced_count,
                 'failed_enhancements': failed_count,
                 'categories_processed': len(categories_updated)
@@ -292,25 +509,75 @@ class ProductProcessor:
     def save_enhanced_json(self, enhanced_data: Dict[str, Any]) -> bool:
         """Save enhanced JSON data to file."""
         try:
-            with open(self.enhanced_json, 'w', encoding='utf-8') as file:
-                json.dump(enhanced_data, file, indent=2, ensure_ascii=False)
+            self._write_json_streamed(self.enhanced_json, enhanced_data)
             logger.info(f"Saved enhanced JSON with {enhanced_data['metadata']['enhancement_stats']['total_products']} products")
             return True
         except Exception as e:
             logger.error(f"Error saving enhanced JSON: {e}")
             return False
     
+    def save_enhanced_json_incremental(self, enhanced_data: Dict[str, Any], categories: Optional[Iterable[str]] = None) -> bool:
+        """
+        Save enhanced data as one file per category plus an index.
+        
+        Only the given categories (default: those touched by the last
+        add_products_to_enhanced_json call) are rewritten; on the first save
+        every category is written.
+        """
+        try:
+            self.categories_dir.mkdir(parents=True, exist_ok=True)
+            index = {"metadata": enhanced_data['metadata'], "categories": {}}
+            if self.categories_index.exists():
+                index['categories'] = self._read_json(self.categories_index)['categories']
+                changed = set(self.categories_updated if categories is None else categories)
+            else:
+                changed = set(enhanced_data['categories'])
+            
+            used_files = {entry['file'] for name, entry in index['categories'].items() if name not in changed}
+            for name, category_data in enhanced_data['categories'].items():
+                if name not in changed and name in index['categories']:
+                    continue
+                # Keep an existing file name; otherwise pick a free slug
+                file_name = index['categories'].get(name, {}).get('file')
+                if file_name is None:
+                    slug = self._category_slug(name)
+                    file_name = f"{slug}.json"
+                    suffix = 2
+                    while file_name in used_files:
+                        file_name = f"{slug}-{suffix}.json"
+                        suffix += 1
+                used_files.add(file_name)
+                path = self.categories_dir / file_name
+                self._write_json(path, category_data)
+                index['categories'][name] = {
+                    "file": file_name,
+                    "count": len(category_data.get('products', [])),
+                    "mtime": path.stat().st_mtime
+                }
+            
+            self._write_json(self.categories_index, index)
+            logger.info(f"Saved {len(changed)} changed category files to {self.categories_dir}")
+            return True
+        except Exception as e:
+            logger.error(f"Error saving category files: {e}")
+            return False
+    
+    @_gc_paused()
     def sync_products_json(self, enhanced_data: Dict[str, Any]) -> bool:
         """Synchronize products.json with enhanced data."""
         try:
             products_list = []
             product_id_counter = 1
+            # One timestamp for the whole batch
+            now = datetime.now()
+            now_iso = now.isoformat() + 'Z'
+            now_ms = int(now.timestamp() * 1000)
             
             for category_data in enhanced_data.get('categories', {}).values():
                 for product in category_data.get('products', []):
                     # Convert to products.json format
                     product_entry = {
-                        'id': f"product-{int(datetime.now().timestamp() * 1000)}-{product_id_counter}",
+                        'id': f"product-{now_ms}-{product_id_counter}",
                         'name': product.get('name', ''),
                         'model': product.get('model_number', ''),
                         'supplier': product.get('supplier', ''),
@@ -324,15 +591,14 @@ class ProductProcessor:
                             'specifications': ' | '.join(product.get('specifications', [])),
                             'features': ''
                         },
-                        'createdAt': datetime.now().isoformat() + 'Z',
-                        'updatedAt': datetime.now().isoformat() + 'Z'
+                        'createdAt': now_iso,
+                        'updatedAt': now_iso
                     }
                     products_list.append(product_entry)
                     product_id_counter += 1
             
             # Save products.json
-            with open(self.products_json, 'w', encoding='utf-8') as file:
-                json.dump(products_list, file, indent=2, ensure_ascii=False)
+            self._write_json(self.products_json, products_list)
             
             logger.info(f"Synchronized products.json with {len(products_list)} products")
             return True
@@ -343,30 +609,34 @@ class ProductProcessor:
     
     def cleanup_redundant_files(self) -> None:
         """Clean up redundant and outdated JSON files."""
-        redundant_files = [
+        redundant_files = {
             'products_hierarchical.json',
             'products_hierarchical_enhanced_v2.json',
             'products_hierarchical_fixed.json',
             'sample_enhancement.json'
-        ]
+        }
         
-        for filename in redundant_files:
-            file_path = self.data_dir / filename
-            if file_path.exists():
-                try:
-                    file_path.unlink()
-                    logger.info(f"Removed redundant file: {filename}")
-                except Exception as e:
-                    logger.error(f"Error removing {filename}: {e}")
+        # One directory scan instead of a stat() per candidate file
+        with os.scandir(self.data_dir) as entries:
+            for entry in entries:
+                if entry.name in redundant_files:
+                    try:
+                        os.unlink(entry.path)
+                        logger.info(f"Removed redundant file: {entry.name}")
+                    except FileNotFoundError:
+                        pass
+                    except Exception as e:
+                        logger.error(f"Error removing {entry.name}: {e}")
     
     def process_new_products(self) -> bool:
         """Main processing pipeline."""
         logger.info("Starting automated product processing pipeline")
         
         try:
-            # Step 1: Load data
-            csv_products = self.load_csv_products()
-            if not csv_products:
+            # Step 1: Load data (CSV rows are streamed; only new products are kept)
+            csv_products = self.iter_csv_products()
+            first_product = next(csv_products, None)
+            if first_product is None:
                 logger.warning("No products found in CSV")
                 return False
             
@@ -374,7 +644,7 @@ class ProductProcessor:
             existing_ids = self.get_existing_product_ids(enhanced_data)
             
             # Step 2: Detect new products
-            new_products = self.detect_new_products(csv_products, existing_ids)
+            new_products = self.detect_new_products(itertools.chain([first_product], csv_products), existing_ids)
             if not new_products:
                 logger.info("No new products to process")
                 return True
@@ -383,7 +653,11 @@ class ProductProcessor:
             enhanced_data = self.add_products_to_enhanced_json(enhanced_data, new_products)
             
             # Step 4: Save enhanced JSON
-            if not self.save_enhanced_json(enhanced_data):
+            if self.split_categories:
+                saved = self.save_enhanced_json_incremental(enhanced_data)
+            else:
+                saved = self.save_enhanced_json(enhanced_data)
+            if not saved:
                 return False
             
             # Step 5: Sync products.json
@@ -402,8 +676,17 @@ class ProductProcessor:
 
 def main():
     """Main entry point."""
-    processor = ProductProcessor()
-    success = processor.process_new_products()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Process new CSV products into the enhanced JSON")
+    parser.add_argument('--data-dir', default='data', help='Data directory path')
+    parser.add_argument('--split-categories', action='store_true',
+                        help='Store enhanced data as per-category files under <data-dir>/categories, rewriting only '
+                             'changed categories (the products_hierarchical_enhanced.json bundle is not updated)')
+    args = parser.parse_args()
+    
+    with ProductProcessor(args.data_dir, split_categories=args.split_categories) as processor:
+        success = processor.process_new_products()
     
     if success:
         print("✅ Product processing completed successfully")
@@ -8,9 +8,14 @@ and updates the hierarchical JSON structure with category metadata.
 
 import json
 import os
+import asyncio
+import contextlib
+import hashlib
+import shelve
 import sys
+import threading
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
 import logging
 from pathlib import Path
 from collections import Counter
@@ -20,6 +25,26 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from brochure.openrouter_client import create_openrouter_client
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -27,17 +52,62 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Maximum number of category description requests in flight at once, and categories per request
+MAX_CONCURRENT_DESCRIPTIONS = 8
+DESCRIPTION_BATCH_SIZE = 25
+
+# Price lists longer than this are reduced with numpy; below it the per-call overhead outweighs the gain
+NUMPY_PRICE_THRESHOLD = 256
+
+def _price_stats(values):
+    """Min, max and mean of a non-empty 1-D float64 array in a single pass."""
+    low = values[0]
+    high = values[0]
+    total = 0.0
+    for value in values:
+        if value < low:
+            low = value
+        elif value > high:
+            high = value
+        total += value
+    return low, high, total / values.shape[0]
+
+# Only worth using compiled; cache=True keeps the compile cost to the first run
+if njit is not None:
+    _price_stats = njit(cache=True)(_price_stats)
+
 class CategoryDescriptionGenerator:
     """Generate descriptions for product categories."""
     
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", max_concurrency: int = MAX_CONCURRENT_DESCRIPTIONS, use_cache: bool = True,
+                 enhanced_json: Optional[str] = None):
         self.data_dir = Path(data_dir)
-        self.enhanced_json = self.data_dir / "products_hierarchical_enhanced.json"
+        self.max_concurrency = max_concurrency
+        # A ".zst" path is read and written zstd-compressed; the default stays plain JSON for other scripts
+        self.enhanced_json = Path(enhanced_json) if enhanced_json else self.data_dir / "products_hierarchical_enhanced.json"
         self.openrouter_client = create_openrouter_client()
+        # AI descriptions keyed by a hash of the prompt inputs, persisted across runs.
+        # Opened only while descriptions are being generated; use_cache=False forces a refresh.
+        self.use_cache = use_cache
+        self.cache_dir = self.data_dir / ".llm_cache"
+        self._cache: Optional[shelve.Shelf] = None
+        self._cache_lock = threading.Lock()
+        # Process-local memo in front of the disk cache, shared by every run of this generator
+        self._memo: Dict[str, str] = {}
+        # Single timestamp stamped on everything generated in a run; refreshed by each public entry point
+        self._run_ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
     def load_enhanced_data(self) -> Dict[str, Any]:
         """Load enhanced JSON data."""
         try:
+            if self.enhanced_json.suffix == '.zst':
+                if zstd is None:
+                    raise ImportError("zstandard is required to read .zst files")
+                with open(self.enhanced_json, 'rb') as file, zstd.ZstdDecompressor().stream_reader(file) as reader:
+                    payload = reader.read()
+                return orjson.loads(payload) if orjson is not None else json.loads(payload)
+            if orjson is not None:
+                return orjson.loads(self.enhanced_json.read_bytes())
             with open(self.enhanced_json, 'r', encoding='utf-8') as file:
                 return json.load(file)
         except Exception as e:
@@ -54,89 +124,168 @@ class CategoryDescriptionGenerator:
             'common_features': [],
             'communication_protocols': [],
             'power_sources': [],
-            'sample_products': []
+            'sample_products': ()
         }
         
-        # Extract suppliers
-        suppliers = [p.get('supplier', '') for p in products if p.get('supplier')]
-        analysis['suppliers'] = list(set(suppliers))
+        # Single pass over the products; dicts give insertion-ordered de-duplication.
+        # Methods and types used per product are bound to locals to skip repeated attribute lookups.
+        suppliers: Dict[str, None] = {}
+        protocols: Dict[str, None] = {}
+        power_sources: Dict[str, None] = {}
+        features: List[str] = []
+        prices = []
+        get = dict.get
+        add_price = prices.append
+        add_features = features.extend
+        numeric = (int, float)
         
-        # Extract price information
-        prices = [p.get('price') for p in products if p.get('price') and isinstance(p.get('price'), (int, float))]
-        if prices:
-            analysis['price_range'] = {
-                'min': min(prices),
-                'max': max(prices),
-                'average': sum(prices) / len(prices)
-            }
-        
-        # Extract communication protocols
-        protocols = []
         for product in products:
-            protocol = product.get('communication_protocol', '')
+            supplier = get(product, 'supplier')
+            if supplier:
+                suppliers[supplier] = None
+            
+            price = get(product, 'price')
+            if price and isinstance(price, numeric):
+                add_price(price)
+            
+            protocol = get(product, 'communication_protocol', '')
             if protocol and protocol != 'Not specified':
-                protocols.extend([p.strip() for p in protocol.split(',')])
-        analysis['communication_protocols'] = list(set(protocols))
-        
-        # Extract power sources
-        power_sources = [p.get('power_source', '') for p in products if p.get('power_source') and p.get('power_source') != 'Not specified']
-        analysis['power_sources'] = list(set(power_sources))
+                for token in protocol.split(','):
+                    protocols[token.strip()] = None
+            
+            power_source = get(product, 'power_source')
+            if power_source and power_source != 'Not specified':
+                power_sources[power_source] = None
+            
+            add_features(
+                spec.split('|', 1)[0].strip().lower()
+                for spec in get(product, 'specifications', [])
+                if isinstance(spec, str) and '|' in spec
+            )
         
-        # Extract common features from specifications
-        all_specs = []
-        for product in products:
-            specs = product.get('specifications', [])
-            for spec in specs:
-                if isinstance(spec, str) and '|' in spec:
-                    feature = spec.split('|')[0].strip().lower()
-                    all_specs.append(feature)
+        feature_counts = Counter(features)
+        analysis['suppliers'] = list(suppliers)
+        if prices:
+            analysis['price_range'] = self._price_range(prices)
+        analysis['communication_protocols'] = list(protocols)
+        analysis['power_sources'] = list(power_sources)
         
         # Get most common features
-        feature_counts = Counter(all_specs)
         analysis['common_features'] = [feature for feature, count in feature_counts.most_common(10)]
         
-        # Sample products for reference
-        analysis['sample_products'] = [
+        # Sample products for reference (a tuple: read-only downstream, and slices of it are cheap)
+        analysis['sample_products'] = tuple(
             {
                 'name': p.get('name', ''),
                 'supplier': p.get('supplier', ''),
                 'model': p.get('model_number', '')
             }
             for p in products[:5]  # First 5 products
-        ]
+        )
         
         return analysis
     
+    @staticmethod
+    def _price_range(prices: List[float]) -> Dict[str, float]:
+        """Min/max/average of a non-empty price list, vectorized for large lists."""
+        if np is not None and len(prices) > NUMPY_PRICE_THRESHOLD:
+            arr = np.array(prices)
+            if njit is not None:
+                low, high, average = _price_stats(arr.astype(np.float64))
+                as_price = int if arr.dtype.kind == 'i' else float
+                return {'min': as_price(low), 'max': as_price(high), 'average': float(average)}
+            return {
+                'min': arr.min().item(),
+                'max': arr.max().item(),
+                'average': arr.mean().item()
+            }
+        return {
+            'min': min(prices),
+            'max': max(prices),
+            'average': sum(prices) / len(prices)
+        }
+    
+    @staticmethod
+    def _build_specs(product_count: int, suppliers: str, protocols: str, samples: str) -> List[str]:
+        """Specification lines for the category prompt, from pre-joined supplier/protocol/sample strings."""
+        return [
+            f"Product Count|{product_count} products available",
+            f"Suppliers|{suppliers}",
+            f"Communication|{protocols or 'Various protocols'}",
+            f"Examples|{samples}"
+        ]
+    
+    @staticmethod
+    def _prompt_key(product_data: Dict[str, Any]) -> str:
+        """Cache key for a prompt, insensitive to key order and specification line order."""
+        canonical = dict(product_data, specifications=sorted(product_data.get('specifications', [])))
+        return hashlib.sha256(json.dumps(canonical, sort_keys=True).encode('utf-8')).hexdigest()
+    
+    def _category_product_data(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the OpenRouter prompt payload describing a category."""
+        category_name = analysis['name']
+        return {
+            'name': f"{category_name} Category Overview",
+            'category': category_name,
+            'description': f"Smart home {category_name.lower()} devices and solutions",
+            'specifications': self._build_specs(
+                analysis['product_count'],
+                ', '.join(analysis['suppliers'][:5]),  # Top 5 suppliers
+                ', '.join(analysis['communication_protocols'][:3]),  # Top 3 protocols
+                ', '.join(p['name'] for p in analysis['sample_products'][:3])
+            )
+        }
+    
+    @staticmethod
+    def _ai_description(enhanced_data: Dict[str, Any], product_data: Dict[str, Any]) -> str:
+        """
+        The AI description from an enhance_specifications(_batch) result, or '' if there is none.
+        
+        The client returns the prompt payload with 'description' replaced by the AI text,
+        so an unchanged description means the enhancement failed or was not applied.
+        """
+        description = enhanced_data.get('description', '')
+        return description if description != product_data.get('description') else ''
+    
+    def _cached_description(self, cache_key: str) -> Optional[str]:
+        """Description generated earlier in this process (memo) or in a previous run (disk cache)."""
+        if not self.use_cache:
+            return None
+        cached = self._memo.get(cache_key)
+        if cached is None and self._cache is not None:
+            with self._cache_lock:
+                cached = self._cache.get(cache_key)
+        if cached is not None:
+            self._memo[cache_key] = cached
+        return cached
+    
+    def _store_description(self, cache_key: str, description: str) -> None:
+        """Remember a genuine AI description in the memo and the disk cache."""
+        self._memo[cache_key] = description
+        if self._cache is not None:
+            with self._cache_lock:
+                self._cache[cache_key] = description
+    
     def generate_category_description(self, analysis: Dict[str, Any]) -> str:
         """Generate a comprehensive category description using AI."""
         try:
             # Prepare context for AI generation
-            category_name = analysis['name']
-            product_count = analysis['product_count']
-            suppliers = ', '.join(analysis['suppliers'][:5])  # Top 5 suppliers
-            protocols = ', '.join(analysis['communication_protocols'][:3])  # Top 3 protocols
-            sample_products = [p['name'] for p in analysis['sample_products']]
+            product_data = self._category_product_data(analysis)
             
-            # Create product data for enhancement
-            product_data = {
-                'name': f"{category_name} Category Overview",
-                'category': category_name,
-                'description': f"Smart home {category_name.lower()} devices and solutions",
-                'specifications': [
-                    f"Product Count|{product_count} products available",
-                    f"Suppliers|{suppliers}",
-                    f"Communication|{protocols}" if protocols else "Communication|Various protocols",
-                    f"Examples|{', '.join(sample_products[:3])}"
-                ]
-            }
+            # Skip the LLM entirely if these exact inputs were described before
+            cache_key = self._prompt_key(product_data)
+            cached = self._cached_description(cache_key)
+            if cached is not None:
+                return cached
             
             # Use OpenRouter client to generate enhanced description
             enhanced_data = self.openrouter_client.enhance_specifications(product_data)
             
-            # Extract the enhanced description
-            description = enhanced_data.get('enhanced_description', '')
+            # Extract the enhanced description; only genuine AI descriptions are cached
+            description = self._ai_description(enhanced_data, product_data)
             
             if description:
+                self._store_description(cache_key, description)
                 return description
             else:
                 return self._generate_fallback_description(analysis)
@@ -164,50 +313,140 @@ class CategoryDescriptionGenerator:
         
         return description
     
-    def generate_category_summary(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate a comprehensive category summary."""
+    def generate_category_summary(self, analysis: Dict[str, Any], description: Optional[str] = None) -> Dict[str, Any]:
+        """Generate a comprehensive category summary; pass an already generated description to skip the AI call."""
         return {
             'name': analysis['name'],
-            'description': self.generate_category_description(analysis),
+            'description': description if description is not None else self.generate_category_description(analysis),
             'product_count': analysis['product_count'],
             'key_suppliers': analysis['suppliers'][:5],
             'supported_protocols': analysis['communication_protocols'],
             'power_options': analysis['power_sources'],
             'price_range': analysis['price_range'],
             'featured_products': analysis['sample_products'][:3],
-            'last_updated': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            'last_updated': self._run_ts
         }
     
+    @staticmethod
+    def _fingerprint(analysis: Dict[str, Any]) -> str:
+        """Stable digest of a category analysis."""
+        if orjson is not None:
+            payload = orjson.dumps(analysis, option=orjson.OPT_SORT_KEYS)
+        else:
+            payload = json.dumps(analysis, sort_keys=True).encode('utf-8')
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+    
+    def _analyze_if_changed(self, category_name: str, category_data: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], str]]:
+        """
+        Analyze a category and return (analysis, fingerprint).
+        
+        Returns None when the category already has an AI description generated from an
+        identical analysis, so the stored description and metadata can be kept as-is.
+        """
+        analysis = self.analyze_category(category_name, category_data['products'])
+        fingerprint = self._fingerprint(analysis)
+        if (self.use_cache and category_data.get('description')
+                and category_data.get('metadata', {}).get('analysis_fingerprint') == fingerprint):
+            return None
+        return analysis, fingerprint
+    
+    async def _describe_batch(self, sem: asyncio.Semaphore, batch: List[Dict[str, Any]]) -> List[str]:
+        """Request descriptions for one batch of category prompts on a worker thread, bounded by the semaphore."""
+        async with sem:
+            enhanced = await asyncio.to_thread(
+                self.openrouter_client.enhance_specifications_batch, batch, len(batch), description_only=True
+            )
+        return [self._ai_description(enhanced_data, product_data) for enhanced_data, product_data in zip(enhanced, batch)]
+    
+    async def _describe_all(self, prompts: List[Dict[str, Any]]) -> List[str]:
+        """
+        Describe category prompts with one OpenRouter request per DESCRIPTION_BATCH_SIZE prompts.
+        
+        Batches run concurrently; a failed batch yields empty descriptions so its categories fall back.
+        """
+        sem = asyncio.Semaphore(self.max_concurrency)
+        batches = [prompts[i:i + DESCRIPTION_BATCH_SIZE] for i in range(0, len(prompts), DESCRIPTION_BATCH_SIZE)]
+        results = await asyncio.gather(*[self._describe_batch(sem, batch) for batch in batches], return_exceptions=True)
+        
+        descriptions = []
+        for batch, result in zip(batches, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error generating AI descriptions for {len(batch)} categories: {result}")
+                result = [''] * len(batch)
+            descriptions.extend(result)
+        return descriptions
+    
     def update_enhanced_json_with_categories(self, enhanced_data: Dict[str, Any]) -> Dict[str, Any]:
         """Update enhanced JSON with category descriptions and metadata."""
+        self._run_ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        enhanced_data, _ = asyncio.run(self._update_categories(enhanced_data.get('categories', {}), enhanced_data))
+        return enhanced_data
+    
+    async def _update_categories(self, categories: Dict[str, Any], enhanced_data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        """Async body of update_enhanced_json_with_categories; also returns how many categories changed."""
         logger.info("Generating category descriptions...")
         
         categories_processed = 0
+        categories_unchanged = 0
         
-        for category_name, category_data in enhanced_data.get('categories', {}).items():
+        # Analyze every category first, then send all uncached prompts to OpenRouter in batches
+        pending = []
+        prompts = []
+        cache_keys = []
+        for category_name, category_data in categories.items():
+            if not category_data.get('products', []):
+                continue
             try:
-                products = category_data.get('products', [])
-                if not products:
-                    continue
-                
-                # Analyze category
-                analysis = self.analyze_category(category_name, products)
-                
-                # Generate category summary
-                category_summary = self.generate_category_summary(analysis)
+                analyzed = self._analyze_if_changed(category_name, category_data)
+            except Exception as e:
+                logger.error(f"Error processing category {category_name}: {e}")
+                continue
+            if analyzed is None:
+                categories_unchanged += 1
+                continue
+            analysis, fingerprint = analyzed
+            product_data = self._category_product_data(analysis)
+            pending.append((category_name, category_data, analysis, fingerprint))
+            prompts.append(product_data)
+            cache_keys.append(self._prompt_key(product_data))
+        
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._cache = shelve.open(str(self.cache_dir / "descriptions"))
+        try:
+            descriptions = [self._cached_description(cache_key) for cache_key in cache_keys]
+            misses = [i for i, description in enumerate(descriptions) if description is None]
+            generated = await self._describe_all([prompts[i] for i in misses])
+            for i, description in zip(misses, generated):
+                if description:
+                    self._store_description(cache_keys[i], description)
+                descriptions[i] = description
+        finally:
+            with self._cache_lock:
+                self._cache.close()
+                self._cache = None
+        
+        for (category_name, category_data, analysis, fingerprint), description in zip(pending, descriptions):
+            try:
+                category_summary = self.generate_category_summary(
+                    analysis, description or self._generate_fallback_description(analysis)
+                )
                 
                 # Update category data
+                metadata = {
+                    'product_count': category_summary['product_count'],
+                    'key_suppliers': category_summary['key_suppliers'],
+                    'supported_protocols': category_summary['supported_protocols'],
+                    'power_options': category_summary['power_options'],
+                    'price_range': category_summary['price_range'],
+                    'featured_products': category_summary['featured_products'],
+                    'last_updated': category_summary['last_updated']
+                }
+                # Only AI (or cached AI) descriptions are fingerprinted; fallbacks are regenerated next run
+                if description:
+                    metadata['analysis_fingerprint'] = fingerprint
                 category_data.update({
                     'description': category_summary['description'],
-                    'metadata': {
-                        'product_count': category_summary['product_count'],
-                        'key_suppliers': category_summary['key_suppliers'],
-                        'supported_protocols': category_summary['supported_protocols'],
-                        'power_options': category_summary['power_options'],
-                        'price_range': category_summary['price_range'],
-                        'featured_products': category_summary['featured_products'],
-                        'last_updated': category_summary['last_updated']
-                    }
+                    'metadata': metadata
                 })
                 
                 categories_processed += 1
@@ -221,18 +460,57 @@ class CategoryDescriptionGenerator:
             enhanced_data['metadata'] = {}
         
         enhanced_data['metadata'].update({
-            'categories_with_descriptions': categories_processed,
-            'category_descriptions_generated_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            'categories_with_descriptions': categories_processed + categories_unchanged,
+            'category_descriptions_generated_at': self._run_ts
         })
         
-        logger.info(f"Generated descriptions for {categories_processed} categories")
-        return enhanced_data
+        logger.info(f"Generated descriptions for {categories_processed} categories ({categories_unchanged} unchanged)")
+        return enhanced_data, categories_processed
+    
+    @staticmethod
+    def _dumps(data: Any) -> bytes:
+        """Serialize data as indented UTF-8 JSON, using orjson when it is installed."""
+        if orjson is not None:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    
+    @classmethod
+    def _write_json_streamed(cls, path: Path, data: Dict[str, Any], stream_key: str = 'categories') -> None:
+        """
+        Write data as indented JSON, serializing data[stream_key] one entry at a time.
+        
+        Output matches json.dump(indent=2) while peak memory is bounded by the largest
+        category rather than the whole document. A ".zst" path is compressed on the fly.
+        """
+        def nested(value: Any, depth: int) -> bytes:
+            return cls._dumps(value).replace(b'\n', b'\n' + b'  ' * depth)
+        
+        compress = path.suffix == '.zst'
+        if compress and zstd is None:
+            raise ImportError("zstandard is required to write .zst files")
+        
+        with contextlib.ExitStack() as stack:
+            file = stack.enter_context(open(path, 'wb'))
+            if compress:
+                file = stack.enter_context(zstd.ZstdCompressor(level=3, threads=-1).stream_writer(file))
+            file.write(b'{')
+            for i, (key, value) in enumerate(data.items()):
+                file.write(b',\n  ' if i else b'\n  ')
+                file.write(cls._dumps(key) + b': ')
+                if key != stream_key or not value:
+                    file.write(nested(value, 1))
+                    continue
+                file.write(b'{')
+                for j, (entry_key, entry) in enumerate(value.items()):
+                    file.write(b',\n    ' if j else b'\n    ')
+                    file.write(cls._dumps(entry_key) + b': ' + nested(entry, 2))
+                file.write(b'\n  }')
+            file.write(b'\n}' if data else b'}')
     
     def save_enhanced_data(self, enhanced_data: Dict[str, Any]) -> bool:
         """Save updated enhanced data to file."""
         try:
-            with open(self.enhanced_json, 'w', encoding='utf-8') as file:
-                json.dump(enhanced_data, file, indent=2, ensure_ascii=False)
+            self._write_json_streamed(self.enhanced_json, enhanced_data)
             logger.info("Saved enhanced data with category descriptions")
             return True
         except Exception as e:
@@ -241,62 +519,71 @@ class CategoryDescriptionGenerator:
     
     def generate_category_report(self, enhanced_data: Dict[str, Any]) -> str:
         """Generate a summary report of all categories."""
-        report_lines = [
-            "# Category Description Report",
-            f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            ""
-        ]
+        return "\n".join(self._iter_report_lines(enhanced_data.get('categories', {})))
+    
+    def _iter_report_lines(self, categories: Dict[str, Any]) -> Iterator[str]:
+        """Yield the report's markdown lines one at a time."""
+        yield "# Category Description Report"
+        yield f"Generated on: {self._run_ts}"
+        yield ""
         
         total_products = 0
-        total_categories = len(enhanced_data.get('categories', {}))
+        total_categories = len(categories)
         
-        for category_name, category_data in enhanced_data.get('categories', {}).items():
+        for category_name, category_data in categories.items():
             products = category_data.get('products', [])
             product_count = len(products)
             total_products += product_count
             
-            report_lines.extend([
-                f"## {category_name}",
-                f"- **Products**: {product_count}",
-                f"- **Description**: {category_data.get('description', 'No description available')[:100]}...",
-                ""
-            ])
+            yield f"## {category_name}"
+            yield f"- **Products**: {product_count}"
+            yield f"- **Description**: {category_data.get('description', 'No description available')[:100]}..."
+            yield ""
         
         # Add summary
-        report_lines.extend([
-            "## Summary",
-            f"- **Total Categories**: {total_categories}",
-            f"- **Total Products**: {total_products}",
-            f"- **Average Products per Category**: {total_products / total_categories if total_categories > 0 else 0:.1f}",
-            ""
-        ])
-        
-        return "\n".join(report_lines)
+        yield "## Summary"
+        yield f"- **Total Categories**: {total_categories}"
+        yield f"- **Total Products**: {total_products}"
+        yield f"- **Average Products per Category**: {total_products / total_categories if total_categories > 0 else 0:.1f}"
+        yield ""
+    
+    @staticmethod
+    def _write_report(report_path: Path, lines: Iterable[str]) -> None:
+        """Write the markdown report line by line, newline-separated as generate_category_report joins them."""
+        with open(report_path, 'w', encoding='utf-8') as file:
+            file.writelines(line if i == 0 else "\n" + line for i, line in enumerate(lines))
     
     def process_categories(self) -> bool:
         """Main processing function."""
+        return asyncio.run(self.process_categories_async())
+    
+    async def process_categories_async(self) -> bool:
+        """Async main processing function; file I/O runs on worker threads off the event loop."""
         logger.info("Starting category description generation")
+        self._run_ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
         try:
             # Load enhanced data
-            enhanced_data = self.load_enhanced_data()
+            enhanced_data = await asyncio.to_thread(self.load_enhanced_data)
             if not enhanced_data:
                 logger.error("No enhanced data found")
                 return False
             
             # Generate category descriptions
-            enhanced_data = self.update_enhanced_json_with_categories(enhanced_data)
+            categories = enhanced_data.setdefault('categories', {})
+            enhanced_data, changed_count = await self._update_categories(categories, enhanced_data)
+            if changed_count == 0:
+                logger.info("No category changes, skipping write")
+                return True
             
             # Save updated data
-            if not self.save_enhanced_data(enhanced_data):
+            if not await asyncio.to_thread(self.save_enhanced_data, enhanced_data):
                 return False
             
             # Generate report
-            report = self.generate_category_report(enhanced_data)
             report_path = self.data_dir.parent / "reports" / "category_descriptions_report.md"
             
-            with open(report_path, 'w', encoding='utf-8') as file:
-                file.write(report)
+            await asyncio.to_thread(self._write_report, report_path, self._iter_report_lines(categories))
             
             logger.info(f"Category description generation completed. Report saved to {report_path}")
             return True
@@ -307,8 +594,17 @@ class CategoryDescriptionGenerator:
 
 def main():
     """Main entry point."""
-    generator = CategoryDescriptionGenerator()
-    success = generator.process_categories()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Generate category descriptions")
+    parser.add_argument('--data-dir', default='data', help='Data directory path')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore cached descriptions and regenerate them all')
+    parser.add_argument('--enhanced-json', help='Enhanced JSON path (default: <data-dir>/products_hierarchical_enhanced.json; .zst is compressed)')
+    
+    args = parser.parse_args()
+    
+    generator = CategoryDescriptionGenerator(args.data_dir, use_cache=not args.no_cache, enhanced_json=args.enhanced_json)
+    success = asyncio.run(generator.process_categories_async())
     
     if success:
         print("✅ Category description generation completed successfully")
@@ -9,34 +9,240 @@ Usage:
     python csv_to_shopify_converter.py
 """
 
+import asyncio
 import csv
+import functools
+import hashlib
+import itertools
 import json
 import os
+import random
+import shelve
 import sys
+import threading
 import time
 import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterable, Iterator, Tuple, Union
 from dataclasses import dataclass
 
+import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
 # Load environment variables
 load_dotenv()
 
 # Add the parent directory to the Python path to import brochure modules
 sys.path.append(str(Path(__file__).parent.parent))
 
+# Status codes worth retrying: rate limits and transient upstream failures
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Rows handed to the AI thread pool at a time; output is flushed in order after each batch
+ENHANCE_BATCH_SIZE = 64
+
+# Completion tokens for a reply's JSON framing (on top of each field's budget), and the cap for one multi-product request
+COMPLETION_TOKENS_BASE = 100
+MAX_BATCH_TOKENS = 16000
+
+# Request timeout: the base covers a default 1000-token completion; larger budgets (multi-product
+# prompts) get extra time at a conservative generation rate instead of timing out and retrying
+DEFAULT_MAX_TOKENS = 1000
+BASE_TIMEOUT = 30.0
+MIN_TOKENS_PER_SECOND = 50
+
+# Rows parsed / written per pandas chunk
+CSV_CHUNK_SIZE = 10000
+
+# Buffer size for the input and output CSV files, so reads and writes hit the disk in ~1MB blocks
+FILE_BUFFER_SIZE = 1 << 20
+
+# Default (requests, tokens) per minute by provider, matched against the API base URL; 0 means unlimited.
+# LLM_RPM / LLM_TPM override these. The last entry is the fallback for self-hosted proxies.
+PROVIDER_RATE_LIMITS = [
+    (re.compile(r'openrouter\.ai'), (200, 0)),
+    (re.compile(r'api\.openai\.com'), (500, 200000)),
+    (re.compile(r'\.openai\.azure\.com'), (300, 150000)),
+    (re.compile(r'api\.anthropic\.com'), (50, 40000)),
+    (re.compile(r''), (300, 0)),
+]
+
+# Fields the AI is asked to fill: key -> (product columns that already supply it, prompt instruction, example value, completion token budget)
+AI_TARGET_FIELDS = {
+    'sales_description': (('sales_description', 'Features'), 'Rich HTML description for customers (include <p>, <ul>, <li> tags)', '<p>Enhanced HTML description...</p>', 400),
+    'purchase_description': (('purchase_description', 'Specification'), 'Technical specifications for internal use', 'Technical specifications...', 200),
+    'upc': (('upc', 'UPC'), 'Generate a realistic UPC code', '123456789012', 20),
+    'ean': (('ean', 'EAN'), 'Generate a realistic EAN code', '1234567890123', 20),
+    'isbn': (('isbn', 'ISBN'), "Leave empty unless it's a book", '', 20),
+    'package_weight': (('package_weight', 'Package Weight'), 'Estimated weight in grams', '500', 10),
+    'package_length': (('package_length', 'Package Length'), 'Estimated length in cm', '15', 10),
+    'package_width': (('package_width', 'Package Width'), 'Estimated width in cm', '10', 10),
+    'package_height': (('package_height', 'Package Height'), 'Estimated height in cm', '8', 10),
+}
+
+# Target fields that are usually legitimately empty, so they never trigger an AI call on their own
+AI_OPTIONAL_FIELDS = {'isbn'}
+
+# Input columns a product list must have, checked against the header as it is read
+REQUIRED_COLUMNS = ['Product Name']
+
+# Slug and price cleanup patterns used for every product
+_NON_ALNUM_RE = re.compile(r'[^a-zA-Z0-9]')
+_DASHES_RE = re.compile(r'-+')
+_CURRENCY_RE = re.compile(r'[^\d.,]')
+
+# Line endings inside quoted fields, normalized to \n as text-mode csv reads did
+_NEWLINE_RE = re.compile(r'\r\n?')
+
+# Outermost JSON object / array in an LLM reply (greedy, so prose around it is skipped)
+_JSON_RE = re.compile(r'\{.*\}', re.DOTALL)
+_JSON_ARRAY_RE = re.compile(r'\[.*\]', re.DOTALL)
+
+# Times a matched span is cut back to an earlier closing bracket before parsing gives up
+JSON_RECOVERY_ATTEMPTS = 16
+
+def _slugify(name: str) -> str:
+    """Lowercase, dash-separated slug of a product name."""
+    return _DASHES_RE.sub('-', _NON_ALNUM_RE.sub('-', name.lower())).strip('-')
+
+def _loads_json(text: Union[str, bytes]) -> Any:
+    """Parse JSON with orjson when it is installed; its decode error subclasses json.JSONDecodeError."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+def _provider_rate_limits(base_url: str) -> Tuple[int, int]:
+    """Default (rpm, tpm) for the provider serving base_url."""
+    for pattern, limits in PROVIDER_RATE_LIMITS:
+        if pattern.search(base_url):
+            return limits
+    return 0, 0
+
+def _missing_ai_fields(product: Dict[str, Any]) -> List[str]:
+    """AI target fields the product has no value for; empty when only optional fields are missing."""
+    missing = [field for field, (columns, *_) in AI_TARGET_FIELDS.items()
+               if not any(product.get(column) for column in columns)]
+    if all(field in AI_OPTIONAL_FIELDS for field in missing):
+        return []
+    return missing
+
+def _loop_running() -> bool:
+    """True when called from inside a running event loop (which can't be blocked on with run_until_complete)."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+def _request_timeout(max_tokens: int) -> float:
+    """Seconds to wait for a completion of up to max_tokens tokens."""
+    return BASE_TIMEOUT + max(0, max_tokens - DEFAULT_MAX_TOKENS) / MIN_TOKENS_PER_SECOND
+
+def _completion_tokens(fields: List[str]) -> int:
+    """max_tokens for a reply holding `fields` for one product."""
+    return COMPLETION_TOKENS_BASE + sum(AI_TARGET_FIELDS[field][3] for field in fields)
+
+def _ai_field_prompt(fields: List[str], indent: str) -> Tuple[str, str]:
+    """Numbered field instructions and the matching JSON example body for an enhancement prompt."""
+    instructions = "\n".join(f'{number}. "{field}" - {AI_TARGET_FIELDS[field][1]}' for number, field in enumerate(fields, 1))
+    example = ",\n".join(f'{indent}"{field}": {json.dumps(AI_TARGET_FIELDS[field][2])}' for field in fields)
+    return instructions, example
+
+@functools.lru_cache(maxsize=1)
+def _load_shopify_headers(path: str) -> Tuple[str, ...]:
+    """Stripped header row of the Shopify sample CSV, read once per process (failures are not cached)."""
+    with open(path, 'r', encoding='utf-8', newline='') as file:
+        return tuple(h.strip() for h in next(csv.reader(file)))
+
+def _strict_json(text: str) -> Any:
+    """The whole reply parsed as JSON, or None if it is not clean JSON."""
+    try:
+        return _loads_json(text)
+    except json.JSONDecodeError:
+        return None
+
+def _loads_json_span(span: str, close: str) -> Any:
+    """Parse a matched JSON span, retrying with it cut back to each earlier `close` bracket (trailing junk, extra blocks)."""
+    end = len(span)
+    for _ in range(JSON_RECOVERY_ATTEMPTS):
+        try:
+            return _loads_json(span[:end])
+        except json.JSONDecodeError as e:
+            error = e
+            end = span.rfind(close, 0, end - 1) + 1
+            if end <= 0:
+                break
+    raise error
+
+def _float_str(value: str) -> str:
+    """str(float(value)), or '' when value is not a number."""
+    try:
+        return str(float(value))
+    except ValueError:
+        return ''
+
 @dataclass
 class LiteLLMConfig:
     """Configuration for LiteLLM client."""
     api_key: str
     base_url: str
     model: str
+    max_concurrency: int = 8
+    requests_per_minute: int = 300
+    tokens_per_minute: int = 0
+    cache_path: Optional[str] = None
+    max_retries: int = 5
+    retry_max_wait: float = 30.0
+    # Ask for response_format json_object; disable for models/endpoints that reject it
+    json_mode: bool = True
+
+class RateLimiter:
+    """Sliding-window limiter allowing at most `rpm` requests and `tpm` tokens in any 60-second window (0 disables either)."""
+    
+    def __init__(self, rpm: int, tpm: int = 0, window: float = 60.0):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.window = window
+        # (timestamp, tokens) per request sent within the window, plus their running token total
+        self._calls = deque()
+        self._tokens = 0
+        self._lock = threading.Lock()
+    
+    def acquire(self, tokens: int = 0):
+        """Block until a request of roughly `tokens` tokens may be sent."""
+        if self.rpm <= 0 and self.tpm <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0][0] >= self.window:
+                    self._tokens -= self._calls.popleft()[1]
+                requests_ok = self.rpm <= 0 or len(self._calls) < self.rpm
+                # A request larger than the whole budget is let through once the window is empty
+                tokens_ok = self.tpm <= 0 or not self._calls or self._tokens + tokens <= self.tpm
+                if requests_ok and tokens_ok:
+                    self._calls.append((now, tokens))
+                    self._tokens += tokens
+                    return
+                wait = self.window - (now - self._calls[0][0])
+            time.sleep(wait)
 
 class LiteLLMClient:
-    """Client for LiteLLM API calls."""
+    """Client for LiteLLM API calls; safe to share between threads."""
     
     def __init__(self, config: LiteLLMConfig):
         self.config = config
@@ -44,39 +250,186 @@ class LiteLLMClient:
             "Authorization": f"Bearer {config.api_key}",
             "Content-Type": "application/json"
         }
+        # Keep-alive connection pool sized to the enhancement thread pool
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=config.max_concurrency, pool_maxsize=config.max_concurrency, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # Caps requests in flight regardless of how many threads call in
+        self._inflight = threading.Semaphore(config.max_concurrency)
+        self.rate_limiter = RateLimiter(config.requests_per_minute, config.tokens_per_minute)
+        # Responses keyed by sha256(model + prompt), persisted across runs when cache_path is set
+        self._cache: Optional[shelve.Shelf] = None
+        self._cache_lock = threading.Lock()
     
-    def _make_api_call(self, prompt: str) -> Optional[str]:
-        """Make API call to LiteLLM."""
-        try:
-            payload = {
-                "model": self.config.model,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                "max_tokens": 1000,
-                "temperature": 0.7
-            }
-            
-            response = requests.post(
-                f"{self.config.base_url}/chat/completions",
-                headers=self.headers,
-                json=payload,
-                timeout=30
-            )
+    def _cache_key(self, prompt: str) -> str:
+        return hashlib.sha256((self.config.model + prompt.strip()).encode('utf-8')).hexdigest()
+    
+    def _open_cache(self) -> Optional[shelve.Shelf]:
+        """Open the response cache on first use; call with _cache_lock held."""
+        if self._cache is None and self.config.cache_path:
+            Path(self.config.cache_path).parent.mkdir(parents=True, exist_ok=True)
+            self._cache = shelve.open(self.config.cache_path)
+        return self._cache
+    
+    def close(self):
+        """Close pooled connections and flush the response cache (both are reopened on the next call)."""
+        self.session.close()
+        with self._cache_lock:
+            if self._cache is not None:
+                self._cache.close()
+                self._cache = None
+    
+    def _make_api_call(self, prompt: str, max_tokens: int = DEFAULT_MAX_TOKENS) -> Optional[str]:
+        """Make API call to LiteLLM, bounded by the concurrency cap and rate limiter; cached responses skip the call (see store_response)."""
+        key = self._cache_key(prompt)
+        with self._cache_lock:
+            cache = self._open_cache()
+            cached = cache.get(key) if cache is not None else None
+        if cached is not None:
+            return cached
+        
+        with self._inflight:
+            return self._post_completion(prompt, max_tokens)
+    
+    def store_response(self, prompt: str, response: str) -> None:
+        """Cache a response for prompt; callers do this only once it parsed, so bad replies are never replayed."""
+        key = self._cache_key(prompt)
+        with self._cache_lock:
+            cache = self._open_cache()
+            if cache is not None:
+                cache[key] = response
+    
+    def _retry_delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """Seconds to wait before the next attempt: Retry-After if given, else full-jitter exponential backoff."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return min(float(retry_after), self.config.retry_max_wait)
+                except ValueError:
+                    pass
+        return random.uniform(0, min(self.config.retry_max_wait, 2 ** attempt))
+    
+    def _completion_payload(self, prompt: str, max_tokens: int) -> Dict[str, Any]:
+        payload = {
+            "model": self.config.model,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "max_tokens": max_tokens,
+            "temperature": 0.7
+        }
+        if self.config.json_mode:
+            payload["response_format"] = {"type": "json_object"}
+        return payload
+    
+    def _post_completion(self, prompt: str, max_tokens: int = DEFAULT_MAX_TOKENS) -> Optional[str]:
+        """Send one chat completion request, retrying rate limits and transient failures."""
+        payload = self._completion_payload(prompt, max_tokens)
+        
+        # Rough prompt size (~4 characters per token) plus the completion budget, for the TPM limit
+        est_tokens = len(prompt) // 4 + max_tokens
+        
+        for attempt in range(self.config.max_retries + 1):
+            self.rate_limiter.acquire(est_tokens)
+            try:
+                response = self.session.post(
+                    f"{self.config.base_url}/chat/completions",
+                    json=payload,
+                    timeout=_request_timeout(max_tokens)
+                )
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                if attempt < self.config.max_retries:
+                    delay = self._retry_delay(attempt)
+                    print(f"Error making API call: {e} (retry {attempt + 1}/{self.config.max_retries} in {delay:.1f}s)")
+                    time.sleep(delay)
+                    continue
+                print(f"Error making API call: {str(e)}")
+                return None
+            except Exception as e:
+                print(f"Error making API call: {str(e)}")
+                return None
             
             if response.status_code == 200:
-                result = response.json()
-                return result.get("choices", [{}])[0].get("message", {}).get("content", "")
-            else:
-                print(f"API call failed with status {response.status_code}: {response.text}")
-                return None
-                
-        except Exception as e:
-            print(f"Error making API call: {str(e)}")
+                try:
+                    # Decode the raw body directly; only the message content is used
+                    result = _loads_json(response.content)
+                    return result.get("choices", [{}])[0].get("message", {}).get("content", "")
+                except Exception as e:
+                    print(f"Error making API call: {str(e)}")
+                    return None
+            
+            if response.status_code in RETRYABLE_STATUS_CODES and attempt < self.config.max_retries:
+                delay = self._retry_delay(attempt, response)
+                print(f"API call failed with status {response.status_code} (retry {attempt + 1}/{self.config.max_retries} in {delay:.1f}s)")
+                time.sleep(delay)
+                continue
+            
+            print(f"API call failed with status {response.status_code}: {response.text}")
             return None
+        
+        return None
+
+    def open_async_session(self) -> "aiohttp.ClientSession":
+        """aiohttp session for _make_api_call_async, its connection pool sized like the threaded one."""
+        connector = aiohttp.TCPConnector(limit=self.config.max_concurrency)
+        return aiohttp.ClientSession(headers=self.headers, connector=connector)
+    
+    async def _make_api_call_async(self, session: "aiohttp.ClientSession", prompt: str, max_tokens: int = DEFAULT_MAX_TOKENS) -> Optional[str]:
+        """Async counterpart of _make_api_call on an aiohttp session; shares the response cache and rate limiter."""
+        key = self._cache_key(prompt)
+        with self._cache_lock:
+            cache = self._open_cache()
+            cached = cache.get(key) if cache is not None else None
+        if cached is not None:
+            return cached
+        
+        return await self._post_completion_async(session, prompt, max_tokens)
+    
+    async def _post_completion_async(self, session: "aiohttp.ClientSession", prompt: str, max_tokens: int = DEFAULT_MAX_TOKENS) -> Optional[str]:
+        """Async counterpart of _post_completion, with the same retry policy."""
+        payload = self._completion_payload(prompt, max_tokens)
+        est_tokens = len(prompt) // 4 + max_tokens
+        timeout = aiohttp.ClientTimeout(total=_request_timeout(max_tokens))
+        
+        for attempt in range(self.config.max_retries + 1):
+            # The limiter sleeps, so wait for it off the event loop
+            await asyncio.to_thread(self.rate_limiter.acquire, est_tokens)
+            try:
+                async with session.post(f"{self.config.base_url}/chat/completions", json=payload, timeout=timeout) as response:
+                    if response.status == 200:
+                        try:
+                            result = _loads_json(await response.read())
+                            return result.get("choices", [{}])[0].get("message", {}).get("content", "")
+                        except Exception as e:
+                            print(f"Error making API call: {str(e)}")
+                            return None
+                    
+                    if response.status in RETRYABLE_STATUS_CODES and attempt < self.config.max_retries:
+                        delay = self._retry_delay(attempt, response)
+                        print(f"API call failed with status {response.status} (retry {attempt + 1}/{self.config.max_retries} in {delay:.1f}s)")
+                    else:
+                        print(f"API call failed with status {response.status}: {await response.text()}")
+                        return None
+            except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as e:
+                if attempt < self.config.max_retries:
+                    delay = self._retry_delay(attempt)
+                    print(f"Error making API call: {e} (retry {attempt + 1}/{self.config.max_retries} in {delay:.1f}s)")
+                else:
+                    print(f"Error making API call: {str(e)}")
+                    return None
+            except Exception as e:
+                print(f"Error making API call: {str(e)}")
+                return None
+            
+            await asyncio.sleep(delay)
+        
+        return None
 
 @dataclass
 class ConversionStats:
@@ -85,6 +438,7 @@ class ConversionStats:
     successful_conversions: int = 0
     ai_enhancements: int = 0
     failed_conversions: int = 0
+    validation_failures: int = 0
     errors: List[str] = None
     
     def __post_init__(self):
@@ -97,6 +451,15 @@ class ShopifyCSVConverter:
     def __init__(self, use_ai_enhancement: bool = True):
         self.use_ai_enhancement = use_ai_enhancement
         self.stats = ConversionStats()
+        # AI enhancement runs on a thread pool; stats are updated under this lock
+        self.max_workers = int(os.getenv('LLM_CONCURRENCY', 8))
+        # Products sent to the model per request (1 disables multi-product prompts)
+        self.llm_batch_size = max(1, int(os.getenv('LLM_BATCH_SIZE', 10)))
+        # Use asyncio + aiohttp for AI requests when installed (LLM_ASYNC=0 forces the thread pool)
+        self.use_async = aiohttp is not None and os.getenv('LLM_ASYNC', '1') != '0'
+        self._stats_lock = threading.Lock()
+        # Input delimiter forced with CSV_DELIMITER; otherwise sniffed per file by load_product_list
+        self._delimiter: Optional[str] = os.getenv('CSV_DELIMITER') or None
         
         # Initialize LiteLLM client
         if self.use_ai_enhancement:
@@ -161,62 +524,87 @@ class ShopifyCSVConverter:
         if not api_key:
             raise ValueError("LITELLM_API_KEY not found in environment variables. Please add it to your .env file.")
         
+        default_rpm, default_tpm = _provider_rate_limits(base_url)
         config = LiteLLMConfig(
             api_key=api_key,
             base_url=base_url.rstrip('/'),  # Remove trailing slash
-            model=model
+            model=model,
+            max_concurrency=self.max_workers,
+            requests_per_minute=int(os.getenv('LLM_RPM', default_rpm)),
+            tokens_per_minute=int(os.getenv('LLM_TPM', default_tpm)),
+            cache_path=str(Path(__file__).parent.parent / ".llm_cache" / "shopify_responses"),
+            json_mode=os.getenv('LLM_JSON_MODE', '1') != '0'
         )
         return LiteLLMClient(config)
 
-    def load_product_list(self, csv_path: str) -> List[Dict[str, Any]]:
-        """Load products from the product list CSV."""
-        products = []
+    def load_product_list(self, csv_path: str) -> Iterator[Dict[str, Any]]:
+        """Stream products from the product list CSV, parsed in chunks by pandas."""
+        count = 0
         
         try:
-            with open(csv_path, 'r', encoding='utf-8') as file:
-                # Use csv.Sniffer to detect delimiter
-                sample = file.read(1024)
-                file.seek(0)
-                sniffer = csv.Sniffer()
-                delimiter = sniffer.sniff(sample).delimiter
-                
-                reader = csv.DictReader(file, delimiter=delimiter)
-                for row in reader:
-                    # Clean up column names (remove extra spaces)
-                    cleaned_row = {k.strip(): v.strip() if v else '' for k, v in row.items()}
-                    products.append(cleaned_row)
+            # The file is opened once: sniffed, header-checked and streamed from the same handle
+            with open(csv_path, 'r', encoding='utf-8', newline='', buffering=FILE_BUFFER_SIZE) as file:
+                chunks = pd.read_csv(
+                    file,
+                    sep=self._delimiter or self._detect_delimiter(file),
+                    dtype=str,
+                    na_filter=False,
+                    chunksize=CSV_CHUNK_SIZE
+                )
+                columns = None
+                for chunk in chunks:
+                    # Clean up column names once (every chunk shares the header) and values (remove extra spaces)
+                    if columns is None:
+                        columns = [h.strip() for h in chunk.columns]
+                        
+                        # Check for at minimum product name column
+                        missing_columns = [col for col in REQUIRED_COLUMNS if col not in columns]
+                        if missing_columns:
+                            error_msg = f"Missing required columns: {missing_columns}"
+                            self.stats.errors.append(error_msg)
+                            print(f"⚠ Warning: {error_msg}")
+                            return
                     
-            print(f"✓ Loaded {len(products)} products from {csv_path}")
-            return products
+                    # Strip values column by column in the chunk itself; only columns holding a \r pay for the regex
+                    for column in chunk.columns:
+                        values = chunk[column]
+                        if values.str.contains('\r', regex=False).any():
+                            values = values.str.replace(_NEWLINE_RE, '\n', regex=True)
+                        chunk[column] = values.str.strip()
+                    # Pair the stripped headers with each row's values by position
+                    for values in chunk.itertuples(index=False, name=None):
+                        count += 1
+                        yield dict(zip(columns, values))
+                    
+            print(f"✓ Loaded {count} products from {csv_path}")
             
         except Exception as e:
             error_msg = f"Error loading product list: {e}"
             self.stats.errors.append(error_msg)
             print(f"✗ {error_msg}")
-            return []
 
     def enhance_product_with_ai(self, product: Dict[str, Any]) -> Dict[str, Any]:
         """Use AI to enhance product data and fill missing fields."""
         if not self.use_ai_enhancement:
             return product
+        
+        # Nothing to fill: skip the API round trip entirely
+        missing = _missing_ai_fields(product)
+        if not missing:
+            return product
             
         try:
-            # Create enhancement prompt
-            prompt = self._create_enhancement_prompt(product)
+            # Create enhancement prompt asking only for the missing fields
+            prompt = self._create_enhancement_prompt(product, missing)
             
-            # Call AI API
-            response = self.ai_client._make_api_call(prompt)
+            # Call AI API with a completion budget sized to the requested fields
+            response = self.ai_client._make_api_call(prompt, max_tokens=_completion_tokens(missing))
             
             if response:
                 enhanced_data = self._parse_ai_response(response)
                 if enhanced_data:
-                    # Merge enhanced data with original product
-                    for key, value in enhanced_data.items():
-                        if value and (not product.get(key) or product.get(key) == ''):
-                            product[key] = value
-                    
-                    self.stats.ai_enhancements += 1
-                    print(f"  ✓ AI enhanced: {product.get('Product Name', 'Unknown')}")
+                    self.ai_client.store_response(prompt, response)
+                    self._merge_enhancement(product, enhanced_data)
                     
             return product
             
@@ -224,13 +612,172 @@ class ShopifyCSVConverter:
             print(f"  ⚠ AI enhancement failed for {product.get('Product Name', 'Unknown')}: {e}")
             return product
 
-    def _create_enhancement_prompt(self, product: Dict[str, Any]) -> str:
-        """Create AI prompt for product enhancement."""
+    def _merge_enhancement(self, product: Dict[str, Any], enhanced_data: Dict[str, Any]):
+        """Merge enhanced data into the product, filling only fields that are missing."""
+        for key, value in enhanced_data.items():
+            if value and (not product.get(key) or product.get(key) == ''):
+                product[key] = value
+        
+        with self._stats_lock:
+            self.stats.ai_enhancements += 1
+        print(f"  ✓ AI enhanced: {product.get('Product Name', 'Unknown')}")
+
+    def _plan_enhancement(self, products: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Optional[str], int]:
+        """Pick the products with missing fields and build one prompt (and token budget) for them; prompt is None if none remain."""
+        pending = [product for product in products if _missing_ai_fields(product)]
+        if not pending:
+            return pending, None, 0
+        if len(pending) == 1:
+            missing = _missing_ai_fields(pending[0])
+            return pending, self._create_enhancement_prompt(pending[0], missing), _completion_tokens(missing)
+        
+        missing_per_product = [_missing_ai_fields(product) for product in pending]
+        missing = set().union(*missing_per_product)
+        prompt = self._create_batch_enhancement_prompt(pending, [field for field in AI_TARGET_FIELDS if field in missing])
+        return pending, prompt, min(sum(_completion_tokens(fields) for fields in missing_per_product), MAX_BATCH_TOKENS)
+
+    def _apply_enhancement_response(self, pending: List[Dict[str, Any]], prompt: str, response: str) -> bool:
+        """
+        Merge a response to a _plan_enhancement prompt into its products; False if a multi-product reply can't be parsed.
+        
+        The response is cached for the prompt only once it parsed.
+        """
+        if len(pending) == 1:
+            enhanced_data = self._parse_ai_response(response)
+            if enhanced_data:
+                self.ai_client.store_response(prompt, response)
+                self._merge_enhancement(pending[0], enhanced_data)
+            return True
+        
+        enhancements = self._parse_ai_batch_response(response, len(pending))
+        if enhancements is None:
+            print(f"  ⚠ Could not parse batch AI response, enhancing {len(pending)} products individually")
+            return False
+        
+        self.ai_client.store_response(prompt, response)
+        for product, enhanced_data in zip(pending, enhancements):
+            if enhanced_data:
+                self._merge_enhancement(product, enhanced_data)
+        return True
+
+    def _needs_single_fallback(self, pending: List[Dict[str, Any]], prompt: str, response: Optional[str]) -> bool:
+        """Apply a _plan_enhancement response; True if a multi-product call failed or its reply can't be parsed."""
+        if response:
+            return not self._apply_enhancement_response(pending, prompt, response)
+        if len(pending) > 1:
+            print(f"  ⚠ Batch AI call failed, enhancing {len(pending)} products individually")
+            return True
+        return False
+
+    def enhance_products_batch(self, products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Enhance several products in place with a single AI call; falls back to one call per product if the reply can't be parsed."""
+        if not self.use_ai_enhancement or not products:
+            return products
+        
+        try:
+            pending, prompt, max_tokens = self._plan_enhancement(products)
+            if prompt is None:
+                return products
+            
+            response = self.ai_client._make_api_call(prompt, max_tokens=max_tokens)
+            if self._needs_single_fallback(pending, prompt, response):
+                for product in pending:
+                    self.enhance_product_with_ai(product)
+            return products
+            
+        except Exception as e:
+            print(f"  ⚠ Batch AI enhancement failed for {len(products)} products: {e}")
+            return products
+
+    async def _enhance_products_batch_async(self, session: "aiohttp.ClientSession", products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Async counterpart of enhance_products_batch."""
+        pending, prompt, max_tokens = self._plan_enhancement(products)
+        if prompt is None:
+            return products
+        
+        response = await self.ai_client._make_api_call_async(session, prompt, max_tokens)
+        if self._needs_single_fallback(pending, prompt, response):
+            for product in pending:
+                single, prompt, max_tokens = self._plan_enhancement([product])
+                response = await self.ai_client._make_api_call_async(session, prompt, max_tokens)
+                if response:
+                    self._apply_enhancement_response(single, prompt, response)
+        return products
+
+    async def _enhance_in_session(self, session: "aiohttp.ClientSession", products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Enhance products in place over an open aiohttp session, at most max_workers requests at a time."""
+        semaphore = asyncio.Semaphore(self.max_workers)
+        groups = [products[i:i + self.llm_batch_size] for i in range(0, len(products), self.llm_batch_size)]
+        
+        async def _bounded(group: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self._enhance_products_batch_async(session, group)
+        
+        results = await asyncio.gather(*(_bounded(group) for group in groups), return_exceptions=True)
+        for group, result in zip(groups, results):
+            if isinstance(result, Exception):
+                # Continue with basic conversion
+                print(f"  ⚠ AI enhancement failed for {len(group)} products: {result}")
+        return products
+
+    async def enhance_all(self, products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Enhance products in place over one aiohttp session, at most max_workers requests at a time."""
+        async with self.ai_client.open_async_session() as session:
+            return await self._enhance_in_session(session, products)
+
+    def _enhance_stream_async(self, products: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Drive the async path ENHANCE_BATCH_SIZE rows at a time on one event loop and one aiohttp session (keep-alive pool)."""
+        async def _open_session() -> "aiohttp.ClientSession":
+            return self.ai_client.open_async_session()
+        
+        loop = asyncio.new_event_loop()
+        try:
+            session = loop.run_until_complete(_open_session())
+            try:
+                while True:
+                    batch = list(itertools.islice(products, ENHANCE_BATCH_SIZE))
+                    if not batch:
+                        break
+                    yield from loop.run_until_complete(self._enhance_in_session(session, batch))
+            finally:
+                loop.run_until_complete(session.close())
+        finally:
+            # The rate limiter waits in the loop's default executor
+            loop.run_until_complete(loop.shutdown_default_executor())
+            loop.close()
+
+    def enhance_products_with_ai(self, products: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Enhance products concurrently (asyncio when available, else a bounded thread pool), ENHANCE_BATCH_SIZE at a time; yields in input order."""
+        print(f"Enhancing products with AI ({self.max_workers} concurrent requests)")
+        products = iter(products)
+        # Inside a running event loop (e.g. a notebook) the thread pool stands in for the async path
+        if self.use_async and not _loop_running():
+            yield from self._enhance_stream_async(products)
+            return
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                batch = list(itertools.islice(products, ENHANCE_BATCH_SIZE))
+                if not batch:
+                    break
+                groups = [batch[i:i + self.llm_batch_size] for i in range(0, len(batch), self.llm_batch_size)]
+                futures = [executor.submit(self.enhance_products_batch, group) for group in groups]
+                for group, future in zip(groups, futures):
+                    try:
+                        yield from future.result()
+                    except Exception as ai_error:
+                        print(f"  ⚠ AI enhancement failed: {ai_error}")
+                        # Continue with basic conversion
+                        yield from group
+
+    def _create_enhancement_prompt(self, product: Dict[str, Any], fields: Optional[List[str]] = None) -> str:
+        """Create AI prompt for product enhancement, asking for `fields` (default: every AI target field)."""
         product_name = product.get('Product Name', '')
         category = product.get('Main Catagory', '')
         sub_category = product.get('Sub - Category', '')
         specs = product.get('Specification', '')
         features = product.get('Features', '')
+        instructions, example = _ai_field_prompt(fields or list(AI_TARGET_FIELDS), '  ')
         
         prompt = f"""You are a product data specialist. Enhance the following product information for Shopify e-commerce:
 
@@ -241,43 +788,93 @@ Current Specifications: {specs}
 Current Features: {features}
 
 Please provide enhanced data in JSON format with these fields:
-1. "sales_description" - Rich HTML description for customers (include <p>, <ul>, <li> tags)
-2. "purchase_description" - Technical specifications for internal use
-3. "upc" - Generate a realistic UPC code
-4. "ean" - Generate a realistic EAN code
-5. "isbn" - Leave empty unless it's a book
-6. "package_weight" - Estimated weight in grams
-7. "package_length" - Estimated length in cm
-8. "package_width" - Estimated width in cm  
-9. "package_height" - Estimated height in cm
+{instructions}
 
 Focus on creating compelling sales copy while maintaining technical accuracy.
 
 Return ONLY valid JSON in this format:
 {{
-  "sales_description": "<p>Enhanced HTML description...</p>",
-  "purchase_description": "Technical specifications...",
-  "upc": "123456789012",
-  "ean": "1234567890123",
-  "isbn": "",
-  "package_weight": "500",
-  "package_length": "15",
-  "package_width": "10",
-  "package_height": "8"
+{example}
 }}"""
         
         return prompt
 
+    def _create_batch_enhancement_prompt(self, products: List[Dict[str, Any]], fields: Optional[List[str]] = None) -> str:
+        """Create one AI prompt enhancing several products, answered as an indexed JSON array of `fields`."""
+        sections = []
+        for index, product in enumerate(products):
+            sections.append(f"""### Product {index}
+Product Name: {product.get('Product Name', '')}
+Category: {product.get('Main Catagory', '')}
+Sub-Category: {product.get('Sub - Category', '')}
+Current Specifications: {product.get('Specification', '')}
+Current Features: {product.get('Features', '')}""")
+        products_text = "\n\n".join(sections)
+        instructions, example = _ai_field_prompt(fields or list(AI_TARGET_FIELDS), '      ')
+        
+        prompt = f"""You are a product data specialist. Enhance the following {len(products)} products for Shopify e-commerce:
+
+{products_text}
+
+For every product, provide enhanced data with these fields:
+{instructions}
+
+Focus on creating compelling sales copy while maintaining technical accuracy.
+
+Return ONLY a valid JSON object whose "products" array has exactly one object per product, where "index" is the number from the product's "### Product" heading:
+{{
+  "products": [
+    {{
+      "index": 0,
+{example}
+    }}
+  ]
+}}"""
+        
+        return prompt
+
+    def _parse_ai_batch_response(self, response: str, count: int) -> Optional[List[Optional[Dict[str, Any]]]]:
+        """Parse a {"products": [...]} (or bare array) AI response into one enhancement (or None) per product index; None if unparseable."""
+        try:
+            items = _strict_json(response)
+            if isinstance(items, dict):
+                items = items.get('products')
+            if items is None:
+                # Not clean JSON (JSON mode off or ignored): fall back to finding the array in the text
+                match = _JSON_ARRAY_RE.search(response)
+                if match:
+                    items = _loads_json_span(match.group(0), ']')
+            
+            if items is not None:
+                if not isinstance(items, list):
+                    return None
+                
+                enhancements: List[Optional[Dict[str, Any]]] = [None] * count
+                for position, item in enumerate(items):
+                    if not isinstance(item, dict):
+                        continue
+                    index = item.pop('index', position)
+                    if isinstance(index, int) and 0 <= index < count:
+                        enhancements[index] = item
+                return enhancements
+                
+        except json.JSONDecodeError as e:
+            print(f"  ⚠ Failed to parse batch AI response: {e}")
+        except Exception as e:
+            print(f"  ⚠ Error parsing batch AI response: {e}")
+            
+        return None
+
     def _parse_ai_response(self, response: str) -> Optional[Dict[str, Any]]:
         """Parse AI response and extract enhanced data."""
         try:
-            # Find JSON in response
-            start_idx = response.find('{')
-            end_idx = response.rfind('}') + 1
-            
-            if start_idx != -1 and end_idx != -1:
-                json_str = response[start_idx:end_idx]
-                return json.loads(json_str)
+            # JSON mode replies are the object itself; otherwise find JSON in response
+            enhanced_data = _strict_json(response)
+            if isinstance(enhanced_data, dict):
+                return enhanced_data
+            match = _JSON_RE.search(response)
+            if match:
+                return _loads_json_span(match.group(0), '}')
                 
         except json.JSONDecodeError as e:
             print(f"  ⚠ Failed to parse AI response: {e}")
@@ -305,22 +902,82 @@ Return ONLY valid JSON in this format:
         
         return shopify_product
 
+    def convert_products_to_shopify(self, products: pd.DataFrame) -> pd.DataFrame:
+        """Convert a frame of products to Shopify format with column operations (vectorized convert_product_to_shopify)."""
+        shopify_products = pd.DataFrame(index=products.index)
+        
+        # Apply direct column mappings
+        for source_col, target_col in self.column_mappings.items():
+            if source_col in products.columns:
+                shopify_products[target_col] = products[source_col]
+        
+        # Apply default values
+        for col, default_value in self.shopify_defaults.items():
+            if col not in shopify_products.columns:
+                shopify_products[col] = default_value
+        
+        # Special handling for specific fields
+        self._apply_special_conversions_frame(products, shopify_products)
+        
+        return shopify_products
+
+    def _apply_special_conversions_frame(self, source: pd.DataFrame, target: pd.DataFrame):
+        """Column-wise equivalent of _apply_special_conversions."""
+        
+        # SKU and handle share one slug of the product name
+        if 'Product Name' in source.columns:
+            handle = (source['Product Name'].str.lower()
+                      .str.replace(_NON_ALNUM_RE, '-', regex=True)
+                      .str.replace(_DASHES_RE, '-', regex=True)
+                      .str.strip('-'))
+        else:
+            handle = pd.Series('', index=source.index)
+        
+        # Generate SKU if missing
+        if 'SKU' in target.columns:
+            missing_sku = target['SKU'] == ''
+            target.loc[missing_sku, 'SKU'] = handle[missing_sku] + '-heyzack'
+        else:
+            target['SKU'] = handle + '-heyzack'
+        
+        # Handle price formatting: remove currency symbols and convert to number
+        if 'SALES PRICE' in source.columns:
+            has_price = source['SALES PRICE'] != ''
+            price_clean = (source.loc[has_price, 'SALES PRICE']
+                           .str.replace(_CURRENCY_RE, '', regex=True)
+                           .str.replace(',', '.', regex=False))
+            target.loc[has_price, 'Selling Price'] = price_clean.map(_float_str)
+        
+        # Handle purchase price
+        if 'Price' in source.columns:
+            has_price = source['Price'] != ''
+            target.loc[has_price, 'Purchase Price'] = source.loc[has_price, 'Price'].map(_float_str)
+        
+        # Create product handle for Shopify
+        target['Handle'] = handle
+        
+        # Set opening stock value based on price and quantity
+        if 'Selling Price' in target.columns and 'Opening Stock' in target.columns:
+            price = pd.to_numeric(target['Selling Price'], errors='coerce')
+            stock = pd.to_numeric(target['Opening Stock'], errors='coerce')
+            valued = price.notna() & stock.notna()
+            target.loc[valued, 'Opening Stock Value'] = (price[valued] * stock[valued]).map(lambda value: str(float(value)))
+
     def _apply_special_conversions(self, source: Dict[str, Any], target: Dict[str, Any]):
         """Apply special conversion logic for specific fields."""
         
+        # SKU and handle share one slug of the product name
+        handle = _slugify(source.get('Product Name', ''))
+        
         # Generate SKU if missing
         if not target.get('SKU'):
-            product_name = source.get('Product Name', '')
-            # Create SKU from product name
-            sku = re.sub(r'[^a-zA-Z0-9]', '-', product_name.lower())
-            sku = re.sub(r'-+', '-', sku).strip('-')
-            target['SKU'] = f"{sku}-heyzack"
+            target['SKU'] = f"{handle}-heyzack"
         
         # Handle price formatting
         sales_price = source.get('SALES PRICE', '')
         if sales_price:
             # Remove currency symbols and convert to number
-            price_clean = re.sub(r'[^\d.,]', '', sales_price)
+            price_clean = _CURRENCY_RE.sub('', sales_price)
             price_clean = price_clean.replace(',', '.')
             try:
                 target['Selling Price'] = str(float(price_clean))
@@ -336,9 +993,6 @@ Return ONLY valid JSON in this format:
                 target['Purchase Price'] = ''
         
         # Create product handle for Shopify
-        product_name = source.get('Product Name', '')
-        handle = re.sub(r'[^a-zA-Z0-9]', '-', product_name.lower())
-        handle = re.sub(r'-+', '-', handle).strip('-')
         target['Handle'] = handle
         
         # Set opening stock value based on price and quantity
@@ -350,39 +1004,22 @@ Return ONLY valid JSON in this format:
             except ValueError:
                 pass
 
+    @staticmethod
+    def _detect_delimiter(file) -> str:
+        """Sniff the delimiter from the start of an open CSV file and rewind it."""
+        sample = file.read(1024)
+        file.seek(0)
+        return csv.Sniffer().sniff(sample).delimiter
+    
     def _validate_input_file(self, input_csv: str) -> bool:
-        """Validate input CSV file exists and has required columns."""
+        """Validate input CSV file exists; required columns are checked by load_product_list as it reads the header."""
         if not os.path.exists(input_csv):
             error_msg = f"Input file not found: {input_csv}"
             self.stats.errors.append(error_msg)
             print(f"✗ {error_msg}")
             return False
         
-        try:
-            with open(input_csv, 'r', encoding='utf-8') as file:
-                sample = file.read(1024)
-                file.seek(0)
-                sniffer = csv.Sniffer()
-                delimiter = sniffer.sniff(sample).delimiter
-                reader = csv.DictReader(file, delimiter=delimiter)
-                headers = reader.fieldnames
-                
-                # Check for at minimum product name column
-                required_columns = ['Product Name']
-                missing_columns = [col for col in required_columns if col not in headers]
-                
-                if missing_columns:
-                    error_msg = f"Missing required columns: {missing_columns}"
-                    self.stats.errors.append(error_msg)
-                    print(f"⚠ Warning: {error_msg}")
-                    return False
-                
-                return True
-        except Exception as e:
-            error_msg = f"Error validating input file: {e}"
-            self.stats.errors.append(error_msg)
-            print(f"✗ {error_msg}")
-            return False
+        return True
     
     def _validate_shopify_product(self, product: Dict[str, Any]) -> bool:
         """Validate that a Shopify product has minimum required fields."""
@@ -424,39 +1061,65 @@ Return ONLY valid JSON in this format:
                 print(f"✗ {error_msg}")
                 return False
         
-        # Load products
+        # Stream products; peek at the first row so an empty or unreadable input writes nothing
         products = self.load_product_list(input_csv)
-        if not products:
+        first_product = next(products, None)
+        if first_product is None:
             return False
-        
-        self.stats.total_products = len(products)
+        products = itertools.chain([first_product], products)
         
         # Get Shopify column headers from the sample file
         shopify_headers = self._get_shopify_headers()
         
-        converted_products = []
-        validation_failures = 0
+        # Enhance with AI if enabled
+        if self.use_ai_enhancement:
+            products = self.enhance_products_with_ai(products)
+        
+        # read -> enhance -> convert -> write, one row flowing through at a time
+        try:
+            success = self._write_shopify_csv(self._convert_products(products), shopify_headers, output_csv)
+        finally:
+            if self.use_ai_enhancement:
+                self.ai_client.close()
+        
+        if self.stats.validation_failures > 0:
+            print(f"\n⚠ Warning: {self.stats.validation_failures} products had validation issues and were fixed with default values")
         
-        for i, product in enumerate(products, 1):
-            print(f"\nProcessing product {i}/{len(products)}: {product.get('Product Name', 'Unknown')}")
+        return success
+
+    def _convert_products(self, products: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Convert products to Shopify rows, CSV_CHUNK_SIZE at a time, updating stats as they stream past."""
+        products = iter(products)
+        offset = 0
+        while True:
+            batch = list(itertools.islice(products, CSV_CHUNK_SIZE))
+            if not batch:
+                break
+            
+            # Convert the whole batch with column operations; fall back to per-row conversion if that fails
+            try:
+                converted = self.convert_products_to_shopify(pd.DataFrame(batch).fillna('')).to_dict(orient='records')
+            except Exception as e:
+                print(f"  ⚠ Batch conversion failed, converting row by row: {e}")
+                converted = [None] * len(batch)
+            
+            yield from self._finish_products(zip(batch, converted), offset)
+            offset += len(batch)
+
+    def _finish_products(self, pairs: Iterable, offset: int) -> Iterator[Dict[str, Any]]:
+        """Validate converted (product, shopify_product) pairs, fixing missing required fields."""
+        for i, (product, shopify_product) in enumerate(pairs, offset + 1):
+            self.stats.total_products += 1
+            print(f"\nProcessing product {i}: {product.get('Product Name', 'Unknown')}")
             
             try:
-                # Enhance with AI if enabled
-                if self.use_ai_enhancement:
-                    try:
-                        product = self.enhance_product_with_ai(product)
-                        # Add small delay to respect API rate limits
-                        time.sleep(0.5)
-                    except Exception as ai_error:
-                        print(f"  ⚠ AI enhancement failed: {ai_error}")
-                        # Continue with basic conversion
-                
                 # Convert to Shopify format
-                shopify_product = self.convert_product_to_shopify(product)
+                if shopify_product is None:
+                    shopify_product = self.convert_product_to_shopify(product)
                 
                 # Validate conversion
                 if not self._validate_shopify_product(shopify_product):
-                    validation_failures += 1
+                    self.stats.validation_failures += 1
                     # Try to fix missing required fields
                     if not shopify_product.get('Item Name'):
                         shopify_product['Item Name'] = f"Product {i}"
@@ -465,13 +1128,9 @@ Return ONLY valid JSON in this format:
                     if not shopify_product.get('Selling Price'):
                         shopify_product['Selling Price'] = '0'
                 
-                # Ensure all required columns are present
-                complete_product = {}
-                for header in shopify_headers:
-                    complete_product[header] = shopify_product.get(header, '')
-                
-                converted_products.append(complete_product)
+                # Missing columns are filled with '' by _write_shopify_csv as it projects onto the headers
                 self.stats.successful_conversions += 1
+                yield shopify_product
                 
             except Exception as e:
                 error_msg = f"Failed to convert product {product.get('Product Name', 'Unknown')}: {e}"
@@ -488,46 +1147,40 @@ Return ONLY valid JSON in this format:
                         'Status': 'draft'
                     }
                     
-                    complete_product = {}
-                    for header in shopify_headers:
-                        complete_product[header] = minimal_product.get(header, '')
-                    
-                    converted_products.append(complete_product)
-                    validation_failures += 1
+                    self.stats.validation_failures += 1
                     print(f"  ✓ Created minimal product entry")
+                    yield minimal_product
                     
                 except Exception as minimal_error:
                     print(f"  ✗ Failed to create minimal product: {minimal_error}")
-        
-        if validation_failures > 0:
-            print(f"\n⚠ Warning: {validation_failures} products had validation issues and were fixed with default values")
-        
-        # Write to output CSV
-        return self._write_shopify_csv(converted_products, shopify_headers, output_csv)
 
-    def _get_shopify_headers(self) -> List[str]:
+    def _get_shopify_headers(self) -> Tuple[str, ...]:
         """Get Shopify CSV headers from the sample file."""
         shopify_csv_path = Path(__file__).parent.parent / "shofify_formate.csv"
         
         try:
-            with open(shopify_csv_path, 'r', encoding='utf-8') as file:
-                reader = csv.reader(file)
-                headers = next(reader)
-                return [h.strip() for h in headers]
+            return _load_shopify_headers(str(shopify_csv_path))
         except Exception as e:
             print(f"⚠ Could not read Shopify headers from sample file: {e}")
             # Return basic headers as fallback
-            return list(self.shopify_defaults.keys()) + ['Item Name', 'SKU', 'Selling Price']
+            return tuple(self.shopify_defaults) + ('Item Name', 'SKU', 'Selling Price')
 
-    def _write_shopify_csv(self, products: List[Dict[str, Any]], headers: List[str], output_path: str) -> bool:
-        """Write products to Shopify format CSV."""
+    def _write_shopify_csv(self, products: Iterable[Dict[str, Any]], headers: Tuple[str, ...], output_path: str) -> bool:
+        """Write products to Shopify format CSV, projecting each onto the headers ('' for missing columns)."""
         try:
-            with open(output_path, 'w', newline='', encoding='utf-8') as file:
-                writer = csv.DictWriter(file, fieldnames=headers)
-                writer.writeheader()
-                writer.writerows(products)
+            count = 0
+            with open(output_path, 'w', newline='', encoding='utf-8', buffering=FILE_BUFFER_SIZE) as file:
+                writer = csv.writer(file)
+                writer.writerow(headers)
+                products = iter(products)
+                while True:
+                    batch = list(itertools.islice(products, CSV_CHUNK_SIZE))
+                    if not batch:
+                        break
+                    writer.writerows([product.get(header, '') for header in headers] for product in batch)
+                    count += len(batch)
             
-            print(f"\n✓ Successfully wrote {len(products)} products to {output_path}")
+            print(f"\n✓ Successfully wrote {count} products to {output_path}")
             return True
             
         except Exception as e:
@@ -9,23 +9,187 @@ Validates the integrity of data after S3 migration to ensure:
 4. No broken references remain
 """
 
+import asyncio
+import functools
 import json
 import csv
+import re
 import requests
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Set, Tuple, Any
-from urllib.parse import urlparse
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Any
+from urllib.parse import ParseResult, urlparse, unquote
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from itertools import islice, repeat
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import boto3
+except ImportError:
+    boto3 = None
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# Concurrent HEAD requests for accessibility checks, sharing one keep-alive connection pool
+MAX_ACCESSIBILITY_WORKERS = 16
+HTTP_POOL_SIZE = 32
+
+# Transient statuses (throttling such as S3 503 SlowDown, upstream errors) retried with exponential backoff
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+HEAD_MAX_RETRIES = 5
+HEAD_BACKOFF_FACTOR = 0.5
+
+# Accessibility checks print a progress line after this many URLs
+PROGRESS_EVERY = 100
+
+# Concurrent HEAD connections when checking with aiohttp on one event loop
+MAX_ASYNC_HEAD_CONNECTIONS = 64
+
+# Upper bound on HEAD requests per second, far below S3's 5,500 GET/HEAD per prefix per second
+MAX_HEAD_REQUESTS_PER_SECOND = 1000
+
+# Data files are scanned on a process pool once a run has at least this many (pool startup outweighs fewer)
+MIN_FILES_FOR_PROCESS_POOL = 4
+
+# URLs embedded in JSON/CSV text: everything after the scheme up to whitespace, a quote, comma or closing bracket.
+# Compiled with RE2 (linear-time DFA matching, GIL released while scanning) when google-re2 is installed
+_URL_RE = (re2 or re).compile(r'https?://[^\s"\',\)\]\}]+')
+_URL_BYTES_RE = (re2 or re).compile(rb'https?://[^\s"\',\)\]\}]+')
+
+# Name fragments of JSON reports written by the migration and by this validator, which are not data files
+REPORT_FILE_MARKERS = ('s3_migration_results', 's3_url_updates', 'data_integrity_validation')
+
+# Reports covering more files than this are written without indentation (it roughly doubles their size)
+COMPACT_REPORT_FILE_COUNT = 1000
+
+# Bucket the migration uploaded to; URLs starting with it count as migrated
+S3_BUCKET_URL = "https://smart-home-product-images.s3.us-east-1.amazonaws.com"
+
+# Google Drive host (and its subdomains), matched against the end of a URL's scheme + host
+DRIVE_HOST = 'drive.google.com'
+_DRIVE_HOST_SUFFIXES = ('//' + DRIVE_HOST, '.' + DRIVE_HOST)
+
+# Bytes read per step when scanning a data file, and the tail kept so a scheme split across reads still matches
+SCAN_CHUNK_SIZE = 1 << 20
+_SCHEME_TAIL = len(b'https://')
+
+def _loads_json(data: bytes) -> Any:
+    """Parse UTF-8 JSON bytes with orjson when it is installed (no intermediate str), else the stdlib"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+@functools.lru_cache(maxsize=65536)
+def _parsed(url: str) -> ParseResult:
+    """urlparse, memoized: data files repeat the same image URLs across many records"""
+    return urlparse(url)
+
+def classify_urls(urls: Iterable[str], s3_bucket_url: str = S3_BUCKET_URL) -> Tuple[Set[str], Set[str], Set[str]]:
+    """Split URLs into disjoint, deduplicated (Drive, S3, other) sets in one pass, by the scheme + host they start with"""
+    drive_urls, s3_urls, other_urls = set(), set(), set()
+    
+    for url in urls:
+        # Scheme and host only: up to the first '/' after "https://" (or "http://x"), then any query/fragment
+        end = url.find('/', 8)
+        origin = url if end == -1 else url[:end]
+        if '?' in origin or '#' in origin:
+            origin = origin.partition('?')[0].partition('#')[0]
+        
+        if origin.endswith(_DRIVE_HOST_SUFFIXES):
+            drive_urls.add(url)
+        elif origin == s3_bucket_url:
+            s3_urls.add(url)
+        else:
+            other_urls.add(url)
+    
+    return drive_urls, s3_urls, other_urls
+
+def iter_file_urls(path: str) -> Iterator[str]:
+    """Yield URLs found in a file, reading it in SCAN_CHUNK_SIZE blocks so memory stays flat on large files"""
+    carry = b''
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(SCAN_CHUNK_SIZE)
+            buf = carry + chunk
+            if buf.find(b'http') < 0:
+                # No scheme anywhere in this block (the common case for URL-free files): skip the regex
+                if not chunk:
+                    return
+                carry = buf[-_SCHEME_TAIL:]
+                continue
+            if not chunk:
+                # End of file: everything left is complete
+                for match in _URL_BYTES_RE.finditer(buf):
+                    yield match.group(0).decode('utf-8')
+                return
+            
+            # A match running into the end of the buffer may continue in the next read, so it is carried over
+            carry_from = max(len(buf) - _SCHEME_TAIL, 0)
+            for match in _URL_BYTES_RE.finditer(buf):
+                if match.end() == len(buf):
+                    carry_from = min(carry_from, match.start())
+                else:
+                    yield match.group(0).decode('utf-8')
+            carry = buf[carry_from:]
+
+def scan_data_file(path: str, s3_bucket_url: str = S3_BUCKET_URL) -> Dict[str, Any]:
+    """Scan one data file's raw text for URLs (the file is not parsed); module-level so process pool workers can run it"""
+    try:
+        # Extract and classify all URLs from the file content
+        drive_urls, s3_urls, other_urls = classify_urls(iter_file_urls(path), s3_bucket_url)
+        
+        return {
+            "file": path,
+            "total_urls": len(drive_urls) + len(s3_urls) + len(other_urls),
+            "s3_urls": len(s3_urls),
+            "drive_urls_remaining": len(drive_urls),
+            "other_urls": len(other_urls),
+            # Kept as sets for the run; the report serializer writes them as JSON arrays
+            "drive_urls_list": drive_urls,
+            "s3_urls_list": s3_urls,
+            "validation_status": "PASS" if len(drive_urls) == 0 else "FAIL"
+        }
+        
+    except Exception as e:
+        return {
+            "file": path,
+            "error": str(e),
+            "validation_status": "ERROR"
+        }
 
 class DataIntegrityValidator:
     """Validates data integrity after S3 migration"""
     
-    def __init__(self, project_root: str = "."):
+    def __init__(self, project_root: str = ".", verbose: bool = False):
         self.project_root = Path(project_root)
+        # Print a line per URL checked (otherwise only progress and totals)
+        self.verbose = verbose
         self.validation_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        self.s3_bucket_url = "https://smart-home-product-images.s3.us-east-1.amazonaws.com"
+        self.s3_bucket_url = S3_BUCKET_URL
+        # Virtual-hosted style URL: <bucket>.s3.<region>.amazonaws.com
+        self.s3_host = urlparse(self.s3_bucket_url).netloc
+        self.s3_bucket, _, self.s3_region = self.s3_host.partition('.s3.')
+        self.s3_region = self.s3_region.split('.')[0]
+        # Keys in the bucket, listed once per run (None until listed, or if listing is unavailable)
+        self._bucket_keys: Optional[Set[str]] = None
+        self._bucket_listed = False
         self.validation_results = {
             "timestamp": datetime.now().isoformat(),
             "total_files_checked": 0,
@@ -38,147 +202,225 @@ class DataIntegrityValidator:
             "validation_errors": [],
             "files_validated": []
         }
+        self._session = requests.Session()
+        # Back off and retry transient failures so throttling isn't reported as a broken URL;
+        # once retries run out the last response is returned and reported with its status
+        retry = Retry(
+            total=HEAD_MAX_RETRIES,
+            backoff_factor=HEAD_BACKOFF_FACTOR,
+            status_forcelist=RETRYABLE_STATUS_CODES,
+            allowed_methods=frozenset(['HEAD']),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        # Earliest monotonic time the next HEAD request may start
+        self._next_head_at = 0.0
+        self._head_lock = threading.Lock()
     
     def find_all_urls_in_text(self, text: str) -> Set[str]:
         """Extract all URLs from text content"""
-        import re
-        url_pattern = r'https?://[^\s\"\'\'\,\)\]\}]+'
-        urls = re.findall(url_pattern, text)
-        return set(urls)
+        return set(_URL_RE.findall(text))
+    
+    def classify_urls(self, urls: Iterable[str]) -> Tuple[Set[str], Set[str], Set[str]]:
+        """Split URLs into deduplicated (Drive, S3, other) sets for this validator's bucket"""
+        return classify_urls(urls, self.s3_bucket_url)
+    
+    def _classify_urls(self, content: str) -> Tuple[Set[str], Set[str], Set[str]]:
+        """Extract and classify the URLs in text, streaming matches straight into the sets"""
+        return self.classify_urls(match.group(0) for match in _URL_RE.finditer(content))
     
     def validate_json_file(self, file_path: Path) -> Dict[str, Any]:
         """Validate URLs in a JSON file"""
-        print(f"\n🔍 Validating JSON: {file_path.name}")
-        
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                data = json.loads(content)
-            
-            # Extract all URLs from the JSON content
-            all_urls = self.find_all_urls_in_text(content)
-            
-            drive_urls = {url for url in all_urls if 'drive.google.com' in url}
-            s3_urls = {url for url in all_urls if self.s3_bucket_url in url}
-            other_urls = all_urls - drive_urls - s3_urls
-            
-            result = {
-                "file": str(file_path),
-                "total_urls": len(all_urls),
-                "s3_urls": len(s3_urls),
-                "drive_urls_remaining": len(drive_urls),
-                "other_urls": len(other_urls),
-                "drive_urls_list": list(drive_urls),
-                "s3_urls_list": list(s3_urls),
-                "validation_status": "PASS" if len(drive_urls) == 0 else "FAIL"
-            }
-            
-            print(f"  📊 URLs found: {len(all_urls)} total, {len(s3_urls)} S3, {len(drive_urls)} Drive")
-            
-            if drive_urls:
-                print(f"  ⚠️  {len(drive_urls)} Google Drive URLs still present!")
-                for url in list(drive_urls)[:3]:  # Show first 3
-                    print(f"    - {url[:80]}...")
-            
-            return result
-            
-        except Exception as e:
-            error_msg = f"Error validating {file_path}: {e}"
-            print(f"  ❌ {error_msg}")
-            self.validation_results["validation_errors"].append(error_msg)
-            return {
-                "file": str(file_path),
-                "error": str(e),
-                "validation_status": "ERROR"
-            }
+        return self._validate_text_file(file_path, "JSON")
     
     def validate_csv_file(self, file_path: Path) -> Dict[str, Any]:
         """Validate URLs in a CSV file"""
-        print(f"\n🔍 Validating CSV: {file_path.name}")
+        return self._validate_text_file(file_path, "CSV")
+    
+    def _validate_text_file(self, file_path: Path, kind: str) -> Dict[str, Any]:
+        """Validate the URLs in a data file by scanning its raw text (the file is not parsed)"""
+        return self._report_file_result(scan_data_file(str(file_path), self.s3_bucket_url), file_path, kind)
+    
+    def _report_file_result(self, result: Dict[str, Any], file_path: Path, kind: str) -> Dict[str, Any]:
+        """Print a scan_data_file result and record its error, if any"""
+        print(f"\n🔍 Validating {kind}: {file_path.name}")
         
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Extract all URLs from the CSV content
-            all_urls = self.find_all_urls_in_text(content)
-            
-            drive_urls = {url for url in all_urls if 'drive.google.com' in url}
-            s3_urls = {url for url in all_urls if self.s3_bucket_url in url}
-            other_urls = all_urls - drive_urls - s3_urls
-            
-            result = {
-                "file": str(file_path),
-                "total_urls": len(all_urls),
-                "s3_urls": len(s3_urls),
-                "drive_urls_remaining": len(drive_urls),
-                "other_urls": len(other_urls),
-                "drive_urls_list": list(drive_urls),
-                "s3_urls_list": list(s3_urls),
-                "validation_status": "PASS" if len(drive_urls) == 0 else "FAIL"
-            }
-            
-            print(f"  📊 URLs found: {len(all_urls)} total, {len(s3_urls)} S3, {len(drive_urls)} Drive")
-            
-            if drive_urls:
-                print(f"  ⚠️  {len(drive_urls)} Google Drive URLs still present!")
-                for url in list(drive_urls)[:3]:  # Show first 3
-                    print(f"    - {url[:80]}...")
-            
-            return result
-            
-        except Exception as e:
-            error_msg = f"Error validating {file_path}: {e}"
+        if "error" in result:
+            error_msg = f"Error validating {file_path}: {result['error']}"
             print(f"  ❌ {error_msg}")
             self.validation_results["validation_errors"].append(error_msg)
-            return {
-                "file": str(file_path),
-                "error": str(e),
-                "validation_status": "ERROR"
-            }
+            return result
+        
+        print(f"  📊 URLs found: {result['total_urls']} total, {result['s3_urls']} S3, {result['drive_urls_remaining']} Drive")
+        
+        drive_urls = result["drive_urls_list"]
+        if drive_urls:
+            print(f"  ⚠️  {len(drive_urls)} Google Drive URLs still present!")
+            for url in islice(drive_urls, 3):  # Show first 3
+                print(f"    - {url[:80]}...")
+        
+        return result
     
-    def check_s3_url_accessibility(self, urls: List[str], sample_size: int = 10) -> Dict[str, Any]:
-        """Check if S3 URLs are accessible (sample check)"""
-        print(f"\n🌐 Checking S3 URL accessibility (sample of {min(sample_size, len(urls))})...")
+    def _scan_data_files(self, files: List[Tuple[Path, str]]) -> List[Dict[str, Any]]:
+        """Scan (path, kind) files, across a process pool for larger runs; results are reported in input order"""
+        paths = [str(file_path) for file_path, _ in files]
+        
+        results = None
+        if len(files) >= MIN_FILES_FOR_PROCESS_POOL:
+            try:
+                with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                    results = list(executor.map(scan_data_file, paths, repeat(self.s3_bucket_url), chunksize=4))
+            except Exception as e:
+                print(f"  ⚠️  Process pool unavailable, scanning files serially: {e}")
+        if results is None:
+            results = [scan_data_file(path, self.s3_bucket_url) for path in paths]
         
+        return [self._report_file_result(result, file_path, kind) for result, (file_path, kind) in zip(results, files)]
+    
+    def check_s3_url_accessibility(self, urls: List[str], sample_size: int = 10) -> Dict[str, Any]:
+        """Check if S3 URLs are accessible: every bucket URL against one bucket listing, HEAD for a sample of the rest"""
         if not urls:
+            print(f"\n🌐 Checking S3 URL accessibility (sample of 0)...")
             return {"accessible": 0, "inaccessible": 0, "total_checked": 0, "broken_urls": []}
         
-        # Sample URLs to check (don't check all to avoid rate limiting)
-        sample_urls = urls[:sample_size] if len(urls) > sample_size else urls
+        bucket_keys = self._list_bucket_keys()
+        if bucket_keys is not None:
+            listed_urls = [url for url in urls if _parsed(url).netloc == self.s3_host]
+            head_urls = [url for url in urls if _parsed(url).netloc != self.s3_host]
+        else:
+            listed_urls, head_urls = [], urls
+        
+        # Sample URLs to HEAD (don't check all to avoid rate limiting)
+        head_urls = head_urls[:sample_size]
+        print(f"\n🌐 Checking S3 URL accessibility ({len(listed_urls)} via bucket listing, sample of {len(head_urls)} via HEAD)...")
         
         accessible = 0
         inaccessible = 0
         broken_urls = []
         
-        for i, url in enumerate(sample_urls):
-            try:
-                print(f"  🔗 Checking {i+1}/{len(sample_urls)}: {url[:60]}...")
-                response = requests.head(url, timeout=10)
-                
-                if response.status_code == 200:
-                    accessible += 1
-                    print(f"    ✅ Accessible")
-                else:
-                    inaccessible += 1
-                    broken_urls.append({"url": url, "status_code": response.status_code})
-                    print(f"    ❌ Status: {response.status_code}")
-                
-                # Small delay to avoid rate limiting
-                time.sleep(0.5)
-                
-            except Exception as e:
+        for url in listed_urls:
+            if unquote(_parsed(url).path.lstrip('/')) in bucket_keys:
+                accessible += 1
+            else:
                 inaccessible += 1
-                broken_urls.append({"url": url, "error": str(e)})
-                print(f"    ❌ Error: {e}")
+                broken_urls.append({"url": url, "error": "Object not found in bucket listing"})
+        if listed_urls:
+            print(f"  📦 Bucket listing: {accessible} found, {inaccessible} missing")
+        
+        if aiohttp is not None and head_urls:
+            head_accessible, head_inaccessible, head_broken = asyncio.run(self._check_accessibility_async(head_urls))
+        else:
+            head_accessible, head_inaccessible, head_broken = self._check_with_head(head_urls)
         
         return {
-            "accessible": accessible,
-            "inaccessible": inaccessible,
-            "total_checked": len(sample_urls),
-            "broken_urls": broken_urls
+            "accessible": accessible + head_accessible,
+            "inaccessible": inaccessible + head_inaccessible,
+            "total_checked": len(listed_urls) + len(head_urls),
+            "broken_urls": broken_urls + head_broken
         }
     
+    def _list_bucket_keys(self) -> Optional[Set[str]]:
+        """All object keys in the S3 bucket via paginated ListObjectsV2, or None without boto3 or credentials"""
+        if not self._bucket_listed:
+            self._bucket_listed = True
+            if boto3 is None:
+                return None
+            try:
+                s3_client = boto3.client('s3', region_name=self.s3_region)
+                paginator = s3_client.get_paginator('list_objects_v2')
+                keys = set()
+                for page in paginator.paginate(Bucket=self.s3_bucket):
+                    keys.update(obj['Key'] for obj in page.get('Contents', []))
+                self._bucket_keys = keys
+                print(f"  📦 Listed {len(keys)} objects in s3://{self.s3_bucket}")
+            except Exception as e:
+                print(f"  ⚠️  Could not list s3://{self.s3_bucket}, falling back to HEAD checks: {e}")
+        return self._bucket_keys
+    
+    def _check_with_head(self, sample_urls: List[str]) -> Tuple[int, int, List[Dict[str, Any]]]:
+        """HEAD each URL concurrently; returns (accessible, inaccessible, broken_urls)"""
+        # Status (or exception) per sample index, so results keep sample order whatever order the checks finish in
+        outcomes: List[Any] = [None] * len(sample_urls)
+        
+        with ThreadPoolExecutor(max_workers=MAX_ACCESSIBILITY_WORKERS) as executor:
+            futures = {executor.submit(self._head, url): i for i, url in enumerate(sample_urls)}
+            for done, future in enumerate(as_completed(futures), 1):
+                try:
+                    outcomes[futures[future]] = future.result().status_code
+                except Exception as e:
+                    outcomes[futures[future]] = e
+                if done % PROGRESS_EVERY == 0:
+                    print(f"  🔗 Checked {done}/{len(sample_urls)} URLs...")
+        
+        return self._tally_head_outcomes(sample_urls, outcomes)
+    
+    def _tally_head_outcomes(self, sample_urls: List[str], outcomes: List[Any]) -> Tuple[int, int, List[Dict[str, Any]]]:
+        """Count HEAD statuses/exceptions per URL into (accessible, inaccessible, broken_urls); per-URL lines only when verbose"""
+        accessible = 0
+        inaccessible = 0
+        broken_urls = []
+        
+        for i, (url, outcome) in enumerate(zip(sample_urls, outcomes)):
+            if self.verbose:
+                print(f"  🔗 Checked {i+1}/{len(sample_urls)}: {url[:60]}...")
+            if isinstance(outcome, Exception):
+                inaccessible += 1
+                broken_urls.append({"url": url, "error": str(outcome)})
+                if self.verbose:
+                    print(f"    ❌ Error: {outcome}")
+            elif outcome == 200:
+                accessible += 1
+                if self.verbose:
+                    print(f"    ✅ Accessible")
+            else:
+                inaccessible += 1
+                broken_urls.append({"url": url, "status_code": outcome})
+                if self.verbose:
+                    print(f"    ❌ Status: {outcome}")
+        
+        if sample_urls:
+            print(f"  🔗 HEAD checks: {accessible} accessible, {inaccessible} inaccessible")
+        return accessible, inaccessible, broken_urls
+    
+    async def _check_accessibility_async(self, sample_urls: List[str]) -> Tuple[int, int, List[Dict[str, Any]]]:
+        """Async counterpart of _check_with_head: all HEADs on one aiohttp session and event loop"""
+        timeout = aiohttp.ClientTimeout(total=10)
+        
+        async def _check(session: "aiohttp.ClientSession", url: str) -> int:
+            # Same retry policy as the session's urllib3 Retry: back off on transient statuses, return the last one
+            for attempt in range(HEAD_MAX_RETRIES + 1):
+                delay = self._reserve_head_slot()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                async with session.head(url, timeout=timeout, allow_redirects=False) as response:
+                    status = response.status
+                if status not in RETRYABLE_STATUS_CODES or attempt == HEAD_MAX_RETRIES:
+                    return status
+                await asyncio.sleep(HEAD_BACKOFF_FACTOR * (2 ** attempt))
+        
+        connector = aiohttp.TCPConnector(limit=MAX_ASYNC_HEAD_CONNECTIONS)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            statuses = await asyncio.gather(*(_check(session, url) for url in sample_urls), return_exceptions=True)
+        
+        return self._tally_head_outcomes(sample_urls, statuses)
+    
+    def _reserve_head_slot(self) -> float:
+        """Claim the next HEAD start time (at most MAX_HEAD_REQUESTS_PER_SECOND); returns seconds to wait for it"""
+        with self._head_lock:
+            now = time.monotonic()
+            start = max(now, self._next_head_at)
+            self._next_head_at = start + 1.0 / MAX_HEAD_REQUESTS_PER_SECOND
+        return start - now
+    
+    def _head(self, url: str) -> requests.Response:
+        """HEAD a URL on the pooled session, spacing requests to at most MAX_HEAD_REQUESTS_PER_SECOND"""
+        delay = self._reserve_head_slot()
+        if delay > 0:
+            time.sleep(delay)
+        return self._session.head(url, timeout=10, allow_redirects=False)
+    
     def validate_migration_completeness(self) -> Dict[str, Any]:
         """Validate that migration was complete by checking migration results"""
         print(f"\n📋 Validating migration completeness...")
@@ -186,15 +428,20 @@ class DataIntegrityValidator:
         try:
             # Find latest migration results
             reports_dir = self.project_root / "reports"
-            migration_files = list(reports_dir.glob("s3_migration_results_*.json"))
+            # (mtime, path) pairs from one directory pass; each entry is stat'ed exactly once
+            migration_files = []
+            if reports_dir.is_dir():
+                with os.scandir(reports_dir) as entries:
+                    migration_files = [(entry.stat().st_mtime, Path(entry.path)) for entry in entries
+                                       if entry.name.startswith("s3_migration_results_") and entry.name.endswith(".json")]
             
             if not migration_files:
                 return {"status": "ERROR", "message": "No migration results found"}
             
-            latest_file = max(migration_files, key=lambda f: f.stat().st_mtime)
+            latest_file = max(migration_files)[1]
             
-            with open(latest_file, 'r') as f:
-                migration_results = json.load(f)
+            with open(latest_file, 'rb') as f:
+                migration_results = _loads_json(f.read())
             
             total_images = migration_results.get('total_images', 0)
             successful = migration_results.get('successful_migrations', 0)
@@ -233,23 +480,34 @@ class DataIntegrityValidator:
         for search_dir in search_dirs:
             dir_path = self.project_root / search_dir
             if dir_path.exists():
-                # Find JSON files (exclude backups and migration results)
-                for json_file in dir_path.rglob('*.json'):
-                    # Skip if in backup directory or is a backup/migration file
-                    if (any(part.startswith('backup') for part in json_file.parts) or 
-                        any(skip in json_file.name for skip in ['s3_migration_results', 's3_url_updates', 'data_integrity_validation'])):
-                        continue
-                    data_files['json'].append(json_file)
-                
-                # Find CSV files (exclude backups)
-                for csv_file in dir_path.rglob('*.csv'):
-                    # Skip if in backup directory
-                    if any(part.startswith('backup') for part in csv_file.parts):
-                        continue
-                    data_files['csv'].append(csv_file)
+                json_files, csv_files = self._walk_data_dir(dir_path)
+                data_files['json'].extend(json_files)
+                data_files['csv'].extend(csv_files)
         
         return data_files
     
+    def _walk_data_dir(self, dir_path: Path) -> Tuple[List[Path], List[Path]]:
+        """Collect (JSON, CSV) data files under dir_path, pruning backup directories instead of descending into them"""
+        json_files, csv_files = [], []
+        pending = [str(dir_path)]
+        
+        while pending:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    # Skip backup directories and backup files
+                    if entry.name.startswith('backup'):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.name.endswith('.json'):
+                        # Skip migration/validation reports, which are outputs rather than data
+                        if not any(skip in entry.name for skip in REPORT_FILE_MARKERS):
+                            json_files.append(Path(entry.path))
+                    elif entry.name.endswith('.csv'):
+                        csv_files.append(Path(entry.path))
+        
+        return json_files, csv_files
+    
     def run_validation(self) -> Dict[str, Any]:
         """Run complete data integrity validation"""
         print("🚀 Starting Data Integrity Validation")
@@ -267,31 +525,24 @@ class DataIntegrityValidator:
         print(f"  CSV files: {len(data_files['csv'])}")
         
         all_s3_urls = set()
+        total_urls = s3_urls = drive_urls = 0
+        append_result = self.validation_results["files_validated"].append
         
-        # Validate JSON files
-        for json_file in data_files['json']:
-            result = self.validate_json_file(json_file)
-            self.validation_results["files_validated"].append(result)
-            
-            if "s3_urls_list" in result:
-                all_s3_urls.update(result["s3_urls_list"])
-            
-            self.validation_results["total_urls_found"] += result.get("total_urls", 0)
-            self.validation_results["s3_urls_found"] += result.get("s3_urls", 0)
-            self.validation_results["drive_urls_remaining"] += result.get("drive_urls_remaining", 0)
-        
-        # Validate CSV files
-        for csv_file in data_files['csv']:
-            result = self.validate_csv_file(csv_file)
-            self.validation_results["files_validated"].append(result)
+        # Validate JSON files, then CSV files
+        files = [(json_file, "JSON") for json_file in data_files['json']] + [(csv_file, "CSV") for csv_file in data_files['csv']]
+        for result in self._scan_data_files(files):
+            append_result(result)
             
             if "s3_urls_list" in result:
-                all_s3_urls.update(result["s3_urls_list"])
+                all_s3_urls |= result["s3_urls_list"]
             
-            self.validation_results["total_urls_found"] += result.get("total_urls", 0)
-            self.validation_results["s3_urls_found"] += result.get("s3_urls", 0)
-            self.validation_results["drive_urls_remaining"] += result.get("drive_urls_remaining", 0)
+            total_urls += result.get("total_urls", 0)
+            s3_urls += result.get("s3_urls", 0)
+            drive_urls += result.get("drive_urls_remaining", 0)
         
+        self.validation_results["total_urls_found"] += total_urls
+        self.validation_results["s3_urls_found"] += s3_urls
+        self.validation_results["drive_urls_remaining"] += drive_urls
         self.validation_results["total_files_checked"] = len(data_files['json']) + len(data_files['csv'])
         
         # Check S3 URL accessibility (sample)
@@ -360,13 +611,20 @@ class DataIntegrityValidator:
             if migration_status.get('status') != 'COMPLETE':
                 print(f"   ❌ Migration status: {migration_status.get('status', 'UNKNOWN')}")
     
+    @staticmethod
+    def _dumps(data: Any, indent: bool = True) -> bytes:
+        """Serialize data as UTF-8 JSON (optionally indented, sets as arrays), using orjson when it is installed"""
+        if orjson is not None:
+            return orjson.dumps(data, default=list, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS if indent else orjson.OPT_NON_STR_KEYS)
+        return json.dumps(data, indent=2 if indent else None, ensure_ascii=False, default=list).encode('utf-8')
+    
     def save_validation_results(self):
         """Save validation results to file"""
         results_file = self.project_root / "reports" / f"data_integrity_validation_{self.validation_timestamp}.json"
         
         try:
-            with open(results_file, 'w', encoding='utf-8') as f:
-                json.dump(self.validation_results, f, indent=2, ensure_ascii=False)
+            indent = len(self.validation_results["files_validated"]) <= COMPACT_REPORT_FILE_COUNT
+            results_file.write_bytes(self._dumps(self.validation_results, indent))
             
             print(f"\n💾 Validation results saved: {results_file}")
             
@@ -375,7 +633,13 @@ class DataIntegrityValidator:
 
 def main():
     """Main execution function"""
-    validator = DataIntegrityValidator()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Validate data integrity after S3 migration")
+    parser.add_argument("--verbose", action="store_true", help="Print the result of every URL accessibility check")
+    args = parser.parse_args()
+    
+    validator = DataIntegrityValidator(verbose=args.verbose)
     results = validator.run_validation()
     
     # Exit with appropriate code
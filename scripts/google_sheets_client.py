@@ -34,6 +34,7 @@ class GoogleSheetsClient:
         self.api_key = api_key
         self.base_url = "https://sheets.googleapis.com/v4/spreadsheets"
         self.session = requests.Session()
+        self._etags: Dict[str, str] = {}
         
     def extract_spreadsheet_id(self, sheets_url: str) -> str:
         """
@@ -80,17 +81,23 @@ class GoogleSheetsClient:
             logger.error(f"Failed to get spreadsheet metadata: {e}")
             raise
     
-    def get_sheet_data(self, spreadsheet_id: str, sheet_name: str, range_spec: str = None) -> List[List[str]]:
+    def get_sheet_data(self, spreadsheet_id: str, sheet_name: str, range_spec: str = None,
+                       if_modified: bool = False) -> Optional[List[List[str]]]:
         """
         Get data from a specific sheet.
         
+        With if_modified, the ETag from the previous if_modified response for the
+        same range is sent as If-None-Match, so an unchanged sheet costs a 304
+        with no body instead of a full range pull.
+        
         Args:
             spreadsheet_id: Google Sheets spreadsheet ID
             sheet_name: Name of the sheet to read
             range_spec: Optional range specification (e.g., "A1:Z1000")
+            if_modified: Return None if the range is unchanged since the last if_modified call
             
         Returns:
-            List of rows, where each row is a list of cell values
+            List of rows, where each row is a list of cell values (None if unchanged)
         """
         # Construct range
         if range_spec:
@@ -104,16 +111,36 @@ class GoogleSheetsClient:
             "valueRenderOption": "UNFORMATTED_VALUE",
             "dateTimeRenderOption": "FORMATTED_STRING"
         }
+        cache_key = f"{spreadsheet_id}/{range_name}"
+        headers = {}
+        if if_modified and cache_key in self._etags:
+            headers["If-None-Match"] = self._etags[cache_key]
         
         try:
-            response = self.session.get(url, params=params)
+            response = self.session.get(url, params=params, headers=headers)
+            if if_modified and response.status_code == 304:
+                return None
             response.raise_for_status()
+            if if_modified:
+                # Without an ETag every call is a full pull, as if if_modified were off
+                etag = response.headers.get("ETag")
+                if etag:
+                    self._etags[cache_key] = etag
             data = response.json()
             return data.get("values", [])
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to get sheet data: {e}")
             raise
     
+    def get_sheet_data_if_modified(self, spreadsheet_id: str, sheet_name: str, range_spec: str = None) -> Optional[List[List[str]]]:
+        """
+        Get data from a specific sheet only if it changed since the last call.
+        
+        Returns:
+            List of rows, or None if the sheet is unchanged since the last call
+        """
+        return self.get_sheet_data(spreadsheet_id, sheet_name, range_spec, if_modified=True)
+    
     def analyze_sheet_structure(self, spreadsheet_id: str, sheet_name: str) -> Dict[str, Any]:
         """
         Analyze the structure of a sheet including headers and data types.
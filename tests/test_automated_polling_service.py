@@ -0,0 +1,26 @@
+"""Product change notifications in the polling service."""
+
+import asyncio
+import json
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from automated_polling_service import AutomatedPollingService
+
+
+def test_notification_is_json_serializable(tmp_path, monkeypatch, caplog):
+    monkeypatch.chdir(tmp_path)
+    service = AutomatedPollingService("https://docs.google.com/spreadsheets/d/sheet-id/edit", str(tmp_path / "products.json"))
+    products = [{"name": "Lock One", "model": "M1", "category": "Locks", "price": 10}, {"model": "M2"}]
+
+    with caplog.at_level(logging.INFO, logger="automated_polling_service"):
+        asyncio.run(service._notify("new_products", products))
+
+    notification = caplog.records[-1].args[1]
+    assert json.loads(json.dumps(notification))["products"] == [
+        {"name": "Lock One", "model": "M1", "category": "Locks"},
+        {"name": "Unknown", "model": "M2", "category": None},
+    ]
@@ -0,0 +1,56 @@
+"""Enhancement cache in ProductProcessor."""
+
+import importlib
+import sys
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+CSV_ROW = {
+    'Supplier': 'Acme', 'Model': 'L-1', 'Product Name': 'Lock One', 'Category': 'Locks',
+    'Specifications': 'Protocol: Zigbee | Battery powered', 'Price': '$12.50', 'Drive Link': 'https://drive.google.com/x'
+}
+
+
+@pytest.fixture
+def processor(tmp_path, monkeypatch):
+    # The module logs to product_processing.log in the working directory
+    monkeypatch.chdir(tmp_path)
+    module = importlib.import_module("automated_product_processor")
+    processor = module.ProductProcessor(str(tmp_path))
+    enhance = mock.patch.object(
+        processor.openrouter_client, "enhance_specifications",
+        side_effect=lambda product_data: dict(product_data, description=f"AI {product_data['name']}")
+    )
+    with enhance:
+        yield processor
+
+
+def _enhance(processor):
+    data = processor._create_empty_enhanced_structure()
+    return processor.add_products_to_enhanced_json(data, [dict(CSV_ROW)])['categories']['Locks']['products'][0]
+
+
+def test_ai_description_is_used_and_cached(processor):
+    assert _enhance(processor)['description'] == "AI Lock One"
+    assert processor.openrouter_client.enhance_specifications.call_count == 1
+
+
+def test_cache_hit_bypasses_client(processor):
+    _enhance(processor)
+    processor.openrouter_client.enhance_specifications.reset_mock()
+
+    assert _enhance(processor)['description'] == "AI Lock One"
+    processor.openrouter_client.enhance_specifications.assert_not_called()
+
+
+def test_unchanged_description_is_not_cached(processor):
+    processor.openrouter_client.enhance_specifications.side_effect = lambda product_data: dict(product_data)
+    first = _enhance(processor)
+    second = _enhance(processor)
+
+    assert first['description'] == second['description'] == "High-quality locks device with advanced features and reliable performance."
+    assert processor.openrouter_client.enhance_specifications.call_count == 2
@@ -0,0 +1,141 @@
+"""Category descriptions: AI text reaches the categories, and repeat runs skip the client."""
+
+import json
+import re
+import shutil
+import sys
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from category_description_generator import CategoryDescriptionGenerator
+
+CATEGORIES = {
+    "Locks": {"products": [{"name": "Lock One", "supplier": "Acme", "specifications": ["Protocol|Zigbee"]}]},
+    "Lights": {"products": [{"name": "Bulb One", "supplier": "Glow", "specifications": ["Power|AC"]}]},
+}
+
+
+def _fake_api_call(prompt, max_tokens=2000, timeout=None):
+    """Answer single and batch enhancement prompts with 'AI <category>' descriptions."""
+    categories = re.findall(r"^Category: (.+)$", prompt, re.M)
+    if "### Product" in prompt:
+        return json.dumps([
+            {"index": index, "enhanced_description": f"AI {category}"}
+            for index, category in enumerate(categories)
+        ])
+    return json.dumps({"enhanced_description": f"AI {categories[0]}"})
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (tmp_path / "reports").mkdir()
+    (data_dir / "products_hierarchical_enhanced.json").write_text(json.dumps({"categories": CATEGORIES}))
+    return data_dir
+
+
+def _generator(data_dir):
+    generator = CategoryDescriptionGenerator(str(data_dir))
+    api_call = mock.patch.object(generator.openrouter_client, "_make_api_call", side_effect=_fake_api_call)
+    return generator, api_call
+
+
+def _saved_categories(data_dir):
+    return json.loads((data_dir / "products_hierarchical_enhanced.json").read_text())["categories"]
+
+
+def test_batch_path_stores_ai_descriptions(data_dir):
+    generator, api_call = _generator(data_dir)
+    with api_call as call:
+        assert generator.process_categories()
+
+    assert call.call_count == 1
+    # Only descriptions are used, so only descriptions are requested
+    prompt = call.call_args.args[0]
+    assert "enhanced_description" in prompt and "enhanced_specifications" not in prompt
+    assert call.call_args.kwargs["max_tokens"] == 2 * 400
+    categories = _saved_categories(data_dir)
+    assert categories["Locks"]["description"] == "AI Locks"
+    assert categories["Lights"]["description"] == "AI Lights"
+
+
+def test_single_path_returns_ai_description(data_dir):
+    generator, api_call = _generator(data_dir)
+    analysis = generator.analyze_category("Locks", CATEGORIES["Locks"]["products"])
+    with api_call as call:
+        assert generator.generate_category_description(analysis) == "AI Locks"
+    assert call.call_count == 1
+
+
+def _reset_data_file(data_dir):
+    """Put back the original, never-described categories."""
+    (data_dir / "products_hierarchical_enhanced.json").write_text(json.dumps({"categories": CATEGORIES}))
+
+
+def _run_once(data_dir):
+    generator, api_call = _generator(data_dir)
+    with api_call:
+        assert generator.process_categories()
+    return generator
+
+
+def test_disk_cache_hit_skips_client(data_dir):
+    _run_once(data_dir)
+    # Fresh generator (empty memo) and no fingerprints: only the disk cache can answer
+    _reset_data_file(data_dir)
+    generator, api_call = _generator(data_dir)
+    with api_call as call:
+        assert generator.process_categories()
+
+    call.assert_not_called()
+    assert _saved_categories(data_dir)["Locks"]["description"] == "AI Locks"
+
+
+def test_unchanged_fingerprint_skips_client(data_dir):
+    generator = _run_once(data_dir)
+    # Without the disk cache, only the stored analysis fingerprints can avoid the client
+    shutil.rmtree(generator.cache_dir)
+    generator, api_call = _generator(data_dir)
+    with api_call as call, mock.patch.object(generator, "_category_product_data", wraps=generator._category_product_data) as build_prompt:
+        assert generator.process_categories()
+
+    call.assert_not_called()
+    build_prompt.assert_not_called()
+    assert _saved_categories(data_dir)["Locks"]["metadata"]["analysis_fingerprint"]
+
+
+def test_memo_hit_skips_client(data_dir):
+    generator, api_call = _generator(data_dir)
+    with api_call as call:
+        generator.update_enhanced_json_with_categories({"categories": json.loads(json.dumps(CATEGORIES))})
+        # Same generator, no disk cache and no fingerprints: only the in-process memo can answer
+        shutil.rmtree(generator.cache_dir)
+        updated = generator.update_enhanced_json_with_categories({"categories": json.loads(json.dumps(CATEGORIES))})
+
+    assert call.call_count == 1
+    assert updated["categories"]["Lights"]["description"] == "AI Lights"
+
+
+def test_no_changes_skips_save_and_client(data_dir):
+    _run_once(data_dir)
+    generator, api_call = _generator(data_dir)
+    with api_call as call, mock.patch.object(generator, "save_enhanced_data") as save:
+        assert generator.process_categories()
+
+    call.assert_not_called()
+    save.assert_not_called()
+
+
+def test_reused_generator_stamps_a_fresh_timestamp(data_dir):
+    generator, api_call = _generator(data_dir)
+    generator._run_ts = "2000-01-01 00:00:00"
+    with api_call:
+        updated = generator.update_enhanced_json_with_categories({"categories": json.loads(json.dumps(CATEGORIES))})
+
+    assert updated["metadata"]["category_descriptions_generated_at"] != "2000-01-01 00:00:00"
+    assert updated["categories"]["Locks"]["metadata"]["last_updated"] == generator._run_ts
@@ -0,0 +1,95 @@
+"""Shopify converter AI path: only parseable replies are cached, and the async stream reuses one session."""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("dotenv")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import csv_to_shopify_converter as converter_module
+
+GOOD_REPLY = json.dumps({"Vendor": "Acme", "Body (HTML)": "<p>Smart lock</p>"})
+
+
+@pytest.fixture
+def converter(tmp_path, monkeypatch):
+    monkeypatch.setenv("LITELLM_API_KEY", "test-key")
+    converter = converter_module.ShopifyCSVConverter(use_ai_enhancement=True)
+    converter.ai_client.config.cache_path = str(tmp_path / "responses")
+    yield converter
+    converter.ai_client.close()
+
+
+def _enhance(converter, *replies):
+    with mock.patch.object(converter.ai_client, "_post_completion", side_effect=list(replies)) as post:
+        product = converter.enhance_product_with_ai({"Product Name": "Lock One"})
+    return product, post
+
+
+def test_parsed_reply_is_replayed_from_cache(converter):
+    first, post = _enhance(converter, GOOD_REPLY)
+    assert first["Vendor"] == "Acme" and post.call_count == 1
+
+    second, post = _enhance(converter)
+    assert second["Vendor"] == "Acme"
+    post.assert_not_called()
+
+
+def test_unparseable_reply_is_not_cached(converter):
+    first, post = _enhance(converter, "Sorry, I cannot help with that.")
+    assert "Vendor" not in first and post.call_count == 1
+
+    second, post = _enhance(converter, GOOD_REPLY)
+    assert second["Vendor"] == "Acme" and post.call_count == 1
+
+
+def test_unparseable_batch_reply_is_not_cached(converter):
+    products = [{"Product Name": "Lock One"}, {"Product Name": "Lock Two"}]
+    with mock.patch.object(converter.ai_client, "_post_completion", side_effect=["[truncated", GOOD_REPLY, GOOD_REPLY]):
+        converter.enhance_products_batch([dict(product) for product in products])
+
+    # The batch prompt must go back to the model, not replay the truncated reply
+    with mock.patch.object(converter.ai_client, "_post_completion", return_value=None) as post:
+        converter.enhance_products_batch([dict(product) for product in products])
+    assert post.call_count == 1
+
+
+def _async_session():
+    session = mock.Mock()
+    session.close = mock.AsyncMock()
+    return session
+
+
+def test_async_stream_shares_one_session_across_batches(converter, monkeypatch):
+    monkeypatch.setattr(converter_module, "ENHANCE_BATCH_SIZE", 2)
+    converter.use_async = True
+    session = _async_session()
+    products = [{"Product Name": f"Lock {i}"} for i in range(5)]
+    with mock.patch.object(converter.ai_client, "open_async_session", return_value=session) as open_session, \
+            mock.patch.object(converter.ai_client, "_post_completion_async", new=mock.AsyncMock(return_value=GOOD_REPLY)) as post:
+        enhanced = list(converter.enhance_products_with_ai(products))
+
+    assert [product["Product Name"] for product in enhanced] == [f"Lock {i}" for i in range(5)]
+    assert all(product["Vendor"] == "Acme" for product in enhanced)
+    open_session.assert_called_once()
+    session.close.assert_awaited_once()
+    assert all(call.args[0] is session for call in post.await_args_list)
+
+
+def test_running_event_loop_falls_back_to_thread_pool(converter):
+    converter.use_async = True
+
+    async def _enhance_inside_loop():
+        return list(converter.enhance_products_with_ai([{"Product Name": "Lock One"}]))
+
+    with mock.patch.object(converter.ai_client, "open_async_session") as open_session, \
+            mock.patch.object(converter.ai_client, "_post_completion", return_value=GOOD_REPLY):
+        enhanced = asyncio.run(_enhance_inside_loop())
+
+    assert enhanced[0]["Vendor"] == "Acme"
+    open_session.assert_not_called()
@@ -0,0 +1,69 @@
+"""Conditional (ETag / If-None-Match) reads in GoogleSheetsClient."""
+
+import sys
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from google_sheets_client import GoogleSheetsClient
+
+
+def _response(status_code, values=None, etag=None):
+    response = mock.Mock()
+    response.status_code = status_code
+    response.headers = {"ETag": etag} if etag else {}
+    response.json.return_value = {"values": values or []}
+    response.raise_for_status.return_value = None
+    return response
+
+
+def _client(*responses):
+    client = GoogleSheetsClient("key")
+    client.session = mock.Mock()
+    client.session.get.side_effect = list(responses)
+    return client
+
+
+def _sent_headers(client):
+    return [call.kwargs["headers"] for call in client.session.get.call_args_list]
+
+
+def test_etag_is_replayed_and_304_returns_none():
+    rows = [["Model"], ["M1"]]
+    client = _client(_response(200, rows, etag='"v1"'), _response(304))
+
+    assert client.get_sheet_data_if_modified("sheet", "Products") == rows
+    assert client.get_sheet_data_if_modified("sheet", "Products") is None
+    assert _sent_headers(client) == [{}, {"If-None-Match": '"v1"'}]
+
+
+def test_changed_sheet_returns_rows_and_updates_etag():
+    client = _client(
+        _response(200, [["Model"], ["M1"]], etag='"v1"'),
+        _response(200, [["Model"], ["M2"]], etag='"v2"'),
+        _response(304),
+    )
+
+    client.get_sheet_data_if_modified("sheet", "Products")
+    assert client.get_sheet_data_if_modified("sheet", "Products") == [["Model"], ["M2"]]
+    assert client.get_sheet_data_if_modified("sheet", "Products") is None
+    assert _sent_headers(client)[1:] == [{"If-None-Match": '"v1"'}, {"If-None-Match": '"v2"'}]
+
+
+def test_missing_etag_falls_back_to_full_reads():
+    rows = [["Model"], ["M1"]]
+    client = _client(_response(200, rows), _response(200, rows))
+
+    assert client.get_sheet_data_if_modified("sheet", "Products") == rows
+    assert client.get_sheet_data_if_modified("sheet", "Products") == rows
+    assert _sent_headers(client) == [{}, {}]
+
+
+def test_plain_reads_never_send_or_store_etags():
+    rows = [["Model"], ["M1"]]
+    client = _client(_response(200, rows, etag='"v1"'), _response(200, rows, etag='"v1"'))
+
+    assert client.get_sheet_data("sheet", "Products") == rows
+    assert client.get_sheet_data("sheet", "Products") == rows
+    assert _sent_headers(client) == [{}, {}]